@@ -1,17 +1,33 @@
-from utils import Problem, ProblemRunner
+import random
+from typing import Iterator
+
+from utils import InputMode, Problem, ProblemRunner, import_numpy
 
 
 class Problem2024Day01(Problem):
     """Solution to 2024/problems/01.md"""
 
+    input_mode = InputMode.STREAM
+    scaling_sizes = (10_000, 100_000, 1_000_000)
+    engines = ("python", "numpy")
+
     def __init__(self):
         """Parses a list of strings into 2 separate lists of integers sorted in increasing order. Each line must have 2
         integers separated by whitespace. The left and right integers will be appended to the left and right lists in
         the return tuple respectively.
+
+        The numpy engine parses the whole file in bulk into two sorted int64 arrays instead.
         """
         super().__init__()
+        if self.engine == "numpy":
+            np = import_numpy()
+            pairs = np.fromfile(self.input_file_path(), dtype=np.int64, sep=" ").reshape(-1, 2)
+            self.list1 = np.sort(pairs[:, 0])
+            self.list2 = np.sort(pairs[:, 1])
+            return
+
         list1, list2 = [], []
-        for line in self.lines:
+        for line in self.iter_input_lines():
             split = line.split()
             list1.append(int(split[0]))
             list2.append(int(split[1]))
@@ -19,12 +35,30 @@ class Problem2024Day01(Problem):
         self.list1 = sorted(list1)
         self.list2 = sorted(list2)
 
+    @classmethod
+    def generate_input(cls, size: int, rng: random.Random) -> Iterator[str]:
+        """Generates `size` pairs of 5 digit location ids. Half of the right ids are drawn from the left ids so that the
+        similarity score is non-trivial.
+
+        :param size: the number of location id pairs
+        :param rng: the seeded random number generator
+        :return: the lines of the input
+        """
+        left = [rng.randint(10_000, 99_999) for _ in range(size)]
+        for location_id in left:
+            right = rng.choice(left) if rng.random() < 0.5 else rng.randint(10_000, 99_999)
+            yield f"{location_id}   {right}"
+
     def part_one(self) -> int:
         """Calculates the total distance of two lists by calculating the summation of the absolute distance between two
         lists of integers by index.
 
         :return: the calculated total distance
         """
+        if self.engine == "numpy":
+            np = import_numpy()
+            return int(np.abs(self.list1 - self.list2).sum())
+
         total_distance = 0
         for i in range(len(self.list1)):
             total_distance += abs(self.list1[i] - self.list2[i])
@@ -41,6 +75,13 @@ class Problem2024Day01(Problem):
 
         :return: the calculated total distance
         """
+        if self.engine == "numpy":
+            np = import_numpy()
+            values, counts = np.unique(self.list2, return_counts=True)
+            indexes = np.minimum(np.searchsorted(values, self.list1), len(values) - 1)
+            occurrences = np.where(values[indexes] == self.list1, counts[indexes], 0)
+            return int((self.list1 * occurrences).sum())
+
         occurrence_map = {}
         for i in self.list2:
             occurrence_map[i] = occurrence_map.get(i, 0) + 1
@@ -1,63 +1,150 @@
-from typing import List
+import random
+from typing import TYPE_CHECKING, Iterator, List
 
-from utils import Problem, ProblemRunner
+from utils import InputMode, Problem, ProblemRunner, import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Problem2024Day02(Problem):
     """Solution to 2024/problems/02.md"""
 
+    input_mode = InputMode.STREAM
+    scaling_sizes = (1_000, 10_000, 100_000)
+    engines = ("python", "numpy")
+
     def __init__(self):
-        """Splits the lines by whitespace to construct the list of reports."""
+        """Splits the lines by whitespace to construct the list of reports of integer levels. The numpy engine also
+        groups the reports by length into 2-D arrays.
+        """
         super().__init__()
-        self.reports = [line.split() for line in self.lines]
+        self.reports = [[int(level) for level in line.split()] for line in self.iter_input_lines()]
+        if self.engine == "numpy":
+            np = import_numpy()
+            reports_by_length = {}
+            for report in self.reports:
+                reports_by_length.setdefault(len(report), []).append(report)
+
+            self.report_batches = [np.array(reports, dtype=np.int64) for reports in reports_by_length.values()]
+
+    @classmethod
+    def generate_input(cls, size: int, rng: random.Random) -> Iterator[str]:
+        """Generates `size` reports of 5 to 8 levels. Every report is monotonic with steps of 1 to 3, but some steps are
+        replaced by a random (possibly unsafe) step so that all cases of the level dampener are exercised.
+
+        :param size: the number of reports
+        :param rng: the seeded random number generator
+        :return: the lines of the input
+        """
+        for _ in range(size):
+            direction = rng.choice((-1, 1))
+            levels = [rng.randint(30, 60)]
+            for _ in range(rng.randint(4, 7)):
+                step = rng.randint(1, 3) if rng.random() < 0.9 else rng.randint(-4, 4)
+                levels.append(levels[-1] + direction * step)
+
+            yield " ".join(str(level) for level in levels)
 
     @staticmethod
-    def is_safe(report: List[int]) -> bool:
-        """Determines whether a report is safe.
+    def is_safe(report: List[int], direction: int = 0, skip: int = -1) -> bool:
+        """Determines whether a report is safe in a single pass. A report is safe if every step between two levels is
+        between 1 and 3 in the same direction.
 
         :param report: the report to verify
+        :param direction: 1 if the levels must increase, -1 if they must decrease, 0 to allow either
+        :param skip: the index of a level to ignore
         :return: true if safe, false otherwise
         """
-        if report == sorted(report):
-            prev_level = None
-            for level in report:
-                if prev_level is None or (prev_level != level and prev_level + 4 > level):
-                    prev_level = level
-                else:
-                    return False
-        elif report == sorted(report, reverse=True):
-            prev_level = None
-            for level in report:
-                if prev_level is None or (prev_level != level and prev_level - 4 < level):
-                    prev_level = level
-                else:
+        prev_level = None
+        for i, level in enumerate(report):
+            if i == skip:
+                continue
+
+            if prev_level is not None:
+                step = level - prev_level
+                if direction == 0:
+                    direction = 1 if step > 0 else -1
+
+                if not 1 <= step * direction <= 3:
                     return False
-        else:
-            return False
+
+            prev_level = level
 
         return True
 
-    def detect_safe(self, reports: List[List[str]], level_dampener_enabled: bool = False) -> int:
+    @staticmethod
+    def is_safe_dampened(report: List[int]) -> bool:
+        """Determines whether a report is safe after removing at most one level in O(k). For a given direction only
+        the two levels of the first unsafe step are candidates for removal: removing any other level leaves that step
+        in the report.
+
+        :param report: the report to verify
+        :return: true if safe, false otherwise
+        """
+        for direction in (1, -1):
+            bad_step = next(
+                (i for i in range(len(report) - 1) if not 1 <= (report[i + 1] - report[i]) * direction <= 3), None
+            )
+            if (
+                bad_step is None
+                or Problem2024Day02.is_safe(report, direction, bad_step)
+                or Problem2024Day02.is_safe(report, direction, bad_step + 1)
+            ):
+                return True
+
+        return False
+
+    @staticmethod
+    def count_safe_batch(batch: "np.ndarray", level_dampener_enabled: bool = False) -> int:
+        """Calculates the number of safe reports in a 2-D array of reports of equal length with vectorized steps.
+
+        With level dampening, removing level j replaces steps j - 1 and j with the bridging step from level j - 1 to
+        level j + 1, so the report is safe if all the steps before j - 1 and after j are valid (prefix/suffix
+        accumulations) and the bridging step is valid.
+
+        :param batch: the reports, one per row
+        :param level_dampener_enabled: whether to use level dampening
+        :return: the number of safe reports
+        """
+        np = import_numpy()
+        num_reports, num_levels = batch.shape
+        if num_levels < 2 or (level_dampener_enabled and num_levels < 3):
+            return num_reports
+
+        steps = np.diff(batch, axis=1)
+        bridges = batch[:, 2:] - batch[:, :-2]
+        safe = np.zeros(num_reports, dtype=bool)
+        for direction in (1, -1):
+            valid = (steps * direction >= 1) & (steps * direction <= 3)
+            safe |= valid.all(axis=1)
+            if not level_dampener_enabled:
+                continue
+
+            # prefix[:, j] -> steps 0..j-1 are valid, suffix[:, j] -> steps j..end are valid
+            ones = np.ones((num_reports, 1), dtype=bool)
+            prefix = np.hstack((ones, np.logical_and.accumulate(valid, axis=1)))
+            suffix = np.hstack((np.logical_and.accumulate(valid[:, ::-1], axis=1)[:, ::-1], ones))
+            valid_bridges = (bridges * direction >= 1) & (bridges * direction <= 3)
+
+            # remove the first, the last or one of the middle levels
+            safe |= suffix[:, 1] | prefix[:, num_levels - 2]
+            safe |= (prefix[:, : num_levels - 2] & valid_bridges & suffix[:, 2:]).any(axis=1)
+
+        return int(safe.sum())
+
+    def detect_safe(self, reports: List[List[int]], level_dampener_enabled: bool = False) -> int:
         """Calculates the total number of safe reports.
 
         :param reports: the reports to verify
         :param level_dampener_enabled: whether to use level dampening
         :return: the total number of safe reports
         """
-        total_safe = 0
-        for report in reports:
-            int_report = [int(c) for c in report]
-            if self.is_safe(int_report):
-                total_safe += 1
-            elif level_dampener_enabled:
-                for i in range(len(int_report)):
-                    cloned = int_report.copy()
-                    del cloned[i]
-                    if self.is_safe(cloned):
-                        total_safe += 1
-                        break
-
-        return total_safe
+        if self.engine == "numpy":
+            return sum(self.count_safe_batch(batch, level_dampener_enabled) for batch in self.report_batches)
+
+        is_safe = self.is_safe_dampened if level_dampener_enabled else self.is_safe
+        return sum(1 for report in reports if is_safe(report))
 
     def part_one(self) -> int:
         """Calculates the total number of safe reports without level dampening.
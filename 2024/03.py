@@ -1,47 +1,110 @@
+import random
 import re
-from typing import List, Tuple
+from typing import Iterable, Iterator, Tuple
 
-from utils import Problem, ProblemRunner
+from utils import InputMode, Problem, ProblemRunner
 
 
 class Problem2024Day03(Problem):
     """Solution to 2024/problems/03.md"""
 
+    input_mode = InputMode.STREAM
+    scaling_sizes = (10_000, 100_000, 1_000_000)
+    chunk_size = 1 << 20
+
+    INSTRUCTION_PATTERN = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+    MAX_INSTRUCTION_LENGTH = len("mul(123,456)")
+
+    def __init__(self):
+        """Scans the corrupted memory for the results of both parts in a single pass over fixed-size chunks."""
+        super().__init__()
+        self.total, self.enabled_total = self.scan(self.iter_input_chunks(self.chunk_size))
+
+    @classmethod
+    def generate_input(cls, size: int, rng: random.Random) -> Iterator[str]:
+        """Generates corrupted memory containing `size` instructions separated by junk. The instructions are mostly
+        `mul(a,b)` with some `do()`, `don't()` and corrupted instructions, and the memory is split into lines of 100
+        instructions.
+
+        :param size: the number of instructions
+        :param rng: the seeded random number generator
+        :return: the lines of the input
+        """
+        junk = "!@#$%^&*()[]{}<>,;:'?/ +-_mulwhyselectfromdonthow"
+        line = []
+        for i in range(size):
+            line.append("".join(rng.choices(junk, k=rng.randint(0, 8))))
+            roll = rng.random()
+            if roll < 0.7:
+                line.append(f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})")
+            elif roll < 0.8:
+                line.append("do()")
+            elif roll < 0.9:
+                line.append("don't()")
+            else:
+                line.append(f"mul({rng.randint(1, 999)}{rng.choice(' *,[')}{rng.randint(1, 999)})")
+
+            if i % 100 == 99:
+                yield "".join(line)
+                line = []
+
+        if line:
+            yield "".join(line)
+
     @staticmethod
-    def identify_mul_ops(lines: List[str]) -> List[Tuple[int, ...]]:
-        """Returns all the multiplication operations found in the list of lines.
+    def scan(chunks: Iterable[bytes]) -> Tuple[int, int]:
+        """Scans the chunks of the corrupted memory for `mul(a,b)`, `do()` and `don't()` instructions in a single pass
+        while keeping track of whether multiplications are enabled.
+
+        Only the instructions that start at least `MAX_INSTRUCTION_LENGTH - 1` bytes before the end of the scanned
+        buffer are complete, the rest of the buffer is carried over to the next chunk so that instructions that cross
+        a chunk boundary are still matched.
 
-        :param lines: the list of lines
-        :return: all multiplication operations modeled as a Tuple with both integers
+        :param chunks: the chunks of the corrupted memory
+        :return: a tuple of the sum of all multiplications and the sum of the enabled multiplications
         """
-        matches = []
-        for line in lines:
-            matches.extend(
-                [tuple([int(i) for i in m[4:-1].split(",")]) for m in re.findall(r"mul\(\d{1,3},\d{1,3}\)", line)]
-            )
+        total = enabled_total = 0
+        enabled = True
+        carry = b""
+        chunks = iter(chunks)
+        while True:
+            chunk = next(chunks, None)
+            buffer = carry + chunk if chunk is not None else carry
+            safe_end = len(buffer) - (Problem2024Day03.MAX_INSTRUCTION_LENGTH - 1) if chunk is not None else len(buffer)
+            scanned_end = 0
+            for match in Problem2024Day03.INSTRUCTION_PATTERN.finditer(buffer):
+                if match.start() >= safe_end:
+                    break
+
+                left, right = match.groups()
+                if left is not None:
+                    product = int(left) * int(right)
+                    total += product
+                    if enabled:
+                        enabled_total += product
+                else:
+                    enabled = match.group() == b"do()"
+
+                scanned_end = match.end()
+
+            if chunk is None:
+                return total, enabled_total
 
-        return matches
+            carry = buffer[max(scanned_end, safe_end) :]
 
     def part_one(self) -> int:
         """Calculates the sum of all the multiplication operations found in the problem input.
 
         :return: the sum of all the multiplication operations found in the problem input
         """
-        return sum([i * j for i, j in self.identify_mul_ops(self.lines)])
+        return self.total
 
     def part_two(self) -> int:
         """Calculates the sum of all the multiplication operations found in the problem input that are not disabled.
 
         :return: the sum of all the multiplication operations found in the problem input that are not disabled
         """
-        matches = []
-        dont_splits = "".join(self.lines).split("don't()")
-        matches.extend(self.identify_mul_ops([dont_splits[0]]))
-        for dont_split in dont_splits[1:]:
-            if "do()" in dont_split:
-                matches.extend(self.identify_mul_ops(dont_split.split("do()")[1:]))
-
-        return sum([i * j for i, j in matches])
+        return self.enabled_total
 
 
 if __name__ == "__main__":
@@ -1,105 +1,175 @@
-from utils import Problem, ProblemRunner
+import random
+import re
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from utils import Grid, InputMode, Problem, ProblemRunner
 
 
 class Problem2024Day04(Problem):
     """Solution to 2024/problems/04.md"""
 
+    input_mode = InputMode.STREAM
+    scaling_sizes = (100, 300, 1_000)
+
+    class WordSearch:
+        """Counts words and 2-D shapes in a grid without a Python-level loop per cell.
+
+        Words are counted with substring search over every row, column and diagonal, which are extracted once into a
+        single buffer of newline separated lines. Shapes are counted by comparing shifted copies of the whole grid: the
+        cells equal to a letter are encoded as a big integer with one byte per cell (0x01 if equal, 0x00 otherwise), so
+        shifting the integer by a number of cells and AND-ing the masks of every letter of a shape matches the shape at
+        every position at once.
+        """
+
+        def __init__(self, grid: Grid):
+            self.grid = grid
+            self._text = None
+            self._masks = {}
+
+        def text(self) -> bytes:
+            """Extracts every row, column and diagonal of the grid, separated by newlines. The grid never contains a
+            newline, so no occurrence of a word spans two lines.
+
+            :return: the newline separated lines of the grid
+            """
+            if self._text is None:
+                grid = self.grid
+                self._text = b"\n".join(
+                    view.tobytes()
+                    for views in (
+                        (grid.row(y) for y in range(grid.height)),
+                        (grid.column(x) for x in range(grid.width)),
+                        grid.diagonals(),
+                        grid.anti_diagonals(),
+                    )
+                    for view in views
+                )
+
+            return self._text
+
+        @staticmethod
+        def count_in(text: bytes, word: bytes, overlapping: bool) -> int:
+            """Counts the possibly overlapping occurrences of a word in a text.
+
+            :param text: the text to search
+            :param word: the word to search for
+            :param overlapping: True if occurrences of the word can overlap, i.e. a prefix of the word is also a suffix
+            :return: the number of occurrences
+            """
+            if overlapping:
+                return len(re.findall(b"(?=" + re.escape(word) + b")", text))
+
+            return text.count(word)
+
+        def count_words(self, words: Iterable[str]) -> Dict[str, int]:
+            """Counts the occurrences of every word in all eight directions.
+
+            :param words: the words to search for
+            :return: a mapping of word to its number of occurrences
+            """
+            counts = {}
+            for word in words:
+                encoded = word.encode()
+                if len(encoded) == 1:
+                    counts[word] = self.grid.data.count(encoded)
+                    continue
+
+                if b"\n" in encoded:
+                    counts[word] = 0
+                    continue
+
+                # a word overlaps itself if and only if its reverse does
+                overlapping = any(encoded[:i] == encoded[-i:] for i in range(1, len(encoded)))
+                variants = {encoded, encoded[::-1]}
+                counts[word] = sum(self.count_in(self.text(), variant, overlapping) for variant in variants)
+
+            return counts
+
+        def mask(self, letter: int) -> int:
+            """Encodes the cells that are equal to a letter as a big integer with one byte per cell.
+
+            :param letter: the byte value of the letter
+            :return: the mask of the letter
+            """
+            if letter not in self._masks:
+                table = bytes(1 if i == letter else 0 for i in range(256))
+                self._masks[letter] = int.from_bytes(self.grid.data.translate(table), "little")
+
+            return self._masks[letter]
+
+        def count_shape(self, shape: Sequence[str]) -> int:
+            """Counts the positions where a shape matches the grid. Cells of the shape that are "." match any letter.
+
+            :param shape: the rows of the shape
+            :return: the number of matching positions
+            """
+            width, height = self.grid.width, self.grid.height
+            shape_width, shape_height = len(shape[0]), len(shape)
+            if shape_width > width or shape_height > height:
+                return 0
+
+            anchors = (b"\x01" * (width - shape_width + 1) + b"\x00" * (shape_width - 1)) * (height - shape_height + 1)
+            matches = int.from_bytes(anchors, "little")
+            for dy, row in enumerate(shape):
+                for dx, letter in enumerate(row.encode()):
+                    if letter != ord("."):
+                        matches &= self.mask(letter) >> (8 * (dy * width + dx))
+
+            return matches.bit_count()
+
+        @staticmethod
+        def rotations(shape: Sequence[str]) -> List[List[str]]:
+            """Finds the distinct rotations of a shape.
+
+            :param shape: the rows of the shape
+            :return: the distinct rotations of the shape
+            """
+            rotations = []
+            rotation = list(shape)
+            for _ in range(4):
+                if rotation not in rotations:
+                    rotations.append(rotation)
+
+                rotation = ["".join(column) for column in zip(*rotation[::-1])]
+
+            return rotations
+
     def __init__(self):
-        """Parses the list of lines into a word search matrix"""
+        """Parses the list of lines into a word search grid"""
         super().__init__()
-        self.matrix = [list(line) for line in self.lines]
+        self.grid = Grid.from_lines(self.iter_input_lines())
+        self.word_search = Problem2024Day04.WordSearch(self.grid)
+
+    @classmethod
+    def generate_input(cls, size: int, rng: random.Random) -> Iterator[str]:
+        """Generates a `size` x `size` word search of random X, M, A and S letters.
+
+        :param size: the width and height of the word search
+        :param rng: the seeded random number generator
+        :return: the lines of the input
+        """
+        for _ in range(size):
+            yield "".join(rng.choices("XMAS", k=size))
 
     def part_one(self) -> int:
-        """Finds all the XMAS occurrences in the word search matrix.
+        """Finds all the XMAS occurrences in the word search grid.
 
-        :return: the number of occurrences in the word search matrix
+        :return: the number of occurrences in the word search grid
         """
-        num_occurrences = 0
-        max_y = len(self.matrix) - 4
-        max_x = len(self.matrix[0]) - 4
-        min_xy = 3
-        for y, chars in enumerate(self.matrix):
-            for x, c in enumerate(chars):
-                if c == "X":
-                    # horizontal
-                    if x <= max_x and chars[x + 1] == "M" and chars[x + 2] == "A" and chars[x + 3] == "S":
-                        num_occurrences += 1
-                    if x >= min_xy and chars[x - 1] == "M" and chars[x - 2] == "A" and chars[x - 3] == "S":
-                        num_occurrences += 1
-
-                    # vertical
-                    if (
-                        y <= max_y
-                        and self.matrix[y + 1][x] == "M"
-                        and self.matrix[y + 2][x] == "A"
-                        and self.matrix[y + 3][x] == "S"
-                    ):
-                        num_occurrences += 1
-                    if (
-                        y >= min_xy
-                        and self.matrix[y - 1][x] == "M"
-                        and self.matrix[y - 2][x] == "A"
-                        and self.matrix[y - 3][x] == "S"
-                    ):
-                        num_occurrences += 1
-
-                    # diagonal right
-                    if (
-                        y >= min_xy
-                        and x <= max_x
-                        and self.matrix[y - 1][x + 1] == "M"
-                        and self.matrix[y - 2][x + 2] == "A"
-                        and self.matrix[y - 3][x + 3] == "S"
-                    ):
-                        num_occurrences += 1
-                    if (
-                        y <= max_y
-                        and x <= max_x
-                        and self.matrix[y + 1][x + 1] == "M"
-                        and self.matrix[y + 2][x + 2] == "A"
-                        and self.matrix[y + 3][x + 3] == "S"
-                    ):
-                        num_occurrences += 1
-
-                    # diagonal left
-                    if (
-                        y >= min_xy
-                        and x >= min_xy
-                        and self.matrix[y - 1][x - 1] == "M"
-                        and self.matrix[y - 2][x - 2] == "A"
-                        and self.matrix[y - 3][x - 3] == "S"
-                    ):
-                        num_occurrences += 1
-                    if (
-                        y <= max_y
-                        and x >= min_xy
-                        and self.matrix[y + 1][x - 1] == "M"
-                        and self.matrix[y + 2][x - 2] == "A"
-                        and self.matrix[y + 3][x - 3] == "S"
-                    ):
-                        num_occurrences += 1
-
-        return num_occurrences
+        return self.word_search.count_words(["XMAS"])["XMAS"]
 
     def part_two(self) -> int:
-        """Finds all the X-MAS occurrences in the word search matrix.
+        """Finds all the X-MAS occurrences in the word search grid, i.e. every rotation of:
+
+        ```
+        M.S
+        .A.
+        M.S
+        ```
 
-        :return: the number of occurrences in the word search matrix
+        :return: the number of occurrences in the word search grid
         """
-        num_occurrences = 0
-        for y, chars in enumerate(self.matrix[1:-1]):
-            for x, c in enumerate(chars[1:-1]):
-                if c == "A":
-                    if (
-                        (self.matrix[y][x] == "M" and self.matrix[y + 2][x + 2] == "S")
-                        or (self.matrix[y][x] == "S" and self.matrix[y + 2][x + 2] == "M")
-                    ) and (
-                        (self.matrix[y + 2][x] == "M" and self.matrix[y][x + 2] == "S")
-                        or (self.matrix[y + 2][x] == "S" and self.matrix[y][x + 2] == "M")
-                    ):
-                        num_occurrences += 1
-
-        return num_occurrences
+        return sum(self.word_search.count_shape(shape) for shape in self.word_search.rotations(["M.S", ".A.", "M.S"]))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,19 @@
-from typing import List
+import random
+from functools import cmp_to_key
+from typing import TYPE_CHECKING, Iterator, List
 
-from utils import Problem, ProblemRunner
+from utils import Problem, ProblemRunner, import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Problem2024Day05(Problem):
     """Solution to 2024/problems/05.md"""
 
+    scaling_sizes = (1_000, 10_000, 50_000)
+    engines = ("python", "numpy")
+
     def __init__(self):
         """Parses the problem input.
 
@@ -22,9 +30,13 @@ class Problem2024Day05(Problem):
         74,56,86,81,84,44,53,92,12,36,15,66,95,26,71
         26,68,47,42,73,41,52,44,78,64,24,76,29,82,38
         ...
+
+        The pages are compiled into dense integer ids, and the rules into a bitset per page of the pages that must
+        print after it. The numpy engine also builds a boolean precedence matrix and groups the updates by length.
         """
         super().__init__()
-        printing_rules = {}
+        page_ids = {}
+        ordering_rules = []
         manual_updates = []
         part1 = True
         for line in self.lines:
@@ -33,44 +45,132 @@ class Problem2024Day05(Problem):
                 continue
 
             if part1:
-                left, right = line.split("|")
-                rules = printing_rules.get(left, set())
-                rules.add(right)
-                printing_rules[left] = rules
+                left, right = (page_ids.setdefault(page, len(page_ids)) for page in line.split("|"))
+                ordering_rules.append((left, right))
             else:
-                manual_updates.append(line.split(","))
+                manual_updates.append([page_ids.setdefault(page, len(page_ids)) for page in line.split(",")])
+
+        self.page_numbers = [int(page) for page in page_ids]
+        self.after_masks = [0] * len(page_ids)
+        for left, right in ordering_rules:
+            self.after_masks[left] |= 1 << right
 
-        self.printing_rules = printing_rules
         self.manual_updates = manual_updates
+        if self.engine == "numpy":
+            np = import_numpy()
+            self.precedence = np.zeros((len(page_ids), len(page_ids)), dtype=bool)
+            if ordering_rules:
+                self.precedence[tuple(np.array(ordering_rules).T)] = True
+
+            updates_by_length = {}
+            for update in manual_updates:
+                updates_by_length.setdefault(len(update), []).append(update)
+
+            self.update_batches = [np.array(updates, dtype=np.intp) for updates in updates_by_length.values()]
+
+    @classmethod
+    def generate_input(cls, size: int, rng: random.Random) -> Iterator[str]:
+        """Generates a rulebook like the puzzle input followed by `size` updates of 5 to 23 pages. The 49 pages are
+        placed on a circle and every page must print before the next 24 pages, so the pages of every update are taken
+        from a window of 24 consecutive pages to keep them totally ordered. Half of the updates are printed in the
+        right order.
+
+        :param size: the number of updates
+        :param rng: the seeded random number generator
+        :return: the lines of the input
+        """
+        pages = rng.sample(range(10, 100), 49)
+        for i, left in enumerate(pages):
+            for offset in range(1, 25):
+                yield f"{left}|{pages[(i + offset) % len(pages)]}"
+
+        yield ""
+        for _ in range(size):
+            start = rng.randrange(len(pages))
+            offsets = rng.sample(range(24), rng.randrange(5, 24, 2))
+            if rng.random() < 0.5:
+                offsets.sort()
+
+            yield ",".join(str(pages[(start + offset) % len(pages)]) for offset in offsets)
+
+    def compare_pages(self, left: int, right: int) -> int:
+        """Orders two pages according to the printing rules.
+
+        :param left: the id of the first page
+        :param right: the id of the second page
+        :return: -1 if left must print before right, 1 if right must print before left, 0 if there is no rule
+        """
+        if self.after_masks[left] >> right & 1:
+            return -1
+
+        if self.after_masks[right] >> left & 1:
+            return 1
+
+        return 0
 
-    def is_update_valid(self, update: List[str]) -> bool:
-        """Checks whether the update is valid.
+    def is_update_valid(self, update: List[int]) -> bool:
+        """Checks whether the update is valid, i.e. no page has to print before a page that precedes it.
 
-        :param update: the update to check
+        :param update: the page ids of the update to check
         :return: true if the update is valid, false otherwise
         """
-        prev_pages = []
-        for s in update:
-            if s not in self.printing_rules:
-                continue
-
-            for p in prev_pages:
-                if p in self.printing_rules[s]:
-                    return False
+        after_masks = self.after_masks
+        seen = 0
+        for page in update:
+            if after_masks[page] & seen:
+                return False
 
-            prev_pages.append(s)
+            seen |= 1 << page
 
         return True
 
+    def validate_batch(self, batch: "np.ndarray") -> "np.ndarray":
+        """Checks the validity of a 2-D array of updates of equal length at once. An update is invalid if one of its
+        pages has to print before one of the pages preceding it, which is a lookup in the precedence matrix for every
+        pair of columns.
+
+        :param batch: the page ids of the updates, one per row
+        :return: whether each update is valid
+        """
+        np = import_numpy()
+        invalid = np.zeros(len(batch), dtype=bool)
+        for j in range(1, batch.shape[1]):
+            invalid |= self.precedence[batch[:, j, None], batch[:, :j]].any(axis=1)
+
+        return ~invalid
+
+    def reordered_middle_pages(self, batch: "np.ndarray") -> "np.ndarray":
+        """Finds the middle page of every update of a 2-D array once reordered. Since the rules totally order the
+        pages of an update, the position of a page in the reordered update is the number of its pages that must print
+        before it.
+
+        :param batch: the page ids of the updates, one per row
+        :return: the page id of the middle page of each reordered update
+        """
+        np = import_numpy()
+        positions = self.precedence[batch[:, :, None], batch[:, None, :]].sum(axis=1)
+        return batch[np.arange(len(batch)), np.argmax(positions == batch.shape[1] // 2, axis=1)]
+
     def part_one(self) -> int:
         """Calculates the total of all the middle numbers in the valid updates.
 
         :return: the calculated total
         """
+        page_numbers = self.page_numbers
+        if self.engine == "numpy":
+            np = import_numpy()
+            numbers = np.array(page_numbers, dtype=np.int64)
+            return int(
+                sum(
+                    numbers[batch[self.validate_batch(batch), len(batch[0]) // 2]].sum()
+                    for batch in self.update_batches
+                )
+            )
+
         total_valid_medians = 0
         for u in self.manual_updates:
             if self.is_update_valid(u):
-                total_valid_medians += int(u[int(len(u) / 2)])
+                total_valid_medians += page_numbers[u[len(u) // 2]]
 
         return total_valid_medians
 
@@ -79,28 +179,24 @@ class Problem2024Day05(Problem):
 
         :return: the calculated total
         """
+        page_numbers = self.page_numbers
+        if self.engine == "numpy":
+            np = import_numpy()
+            numbers = np.array(page_numbers, dtype=np.int64)
+            return int(
+                sum(
+                    numbers[self.reordered_middle_pages(batch[~self.validate_batch(batch)])].sum()
+                    for batch in self.update_batches
+                )
+            )
+
+        key = cmp_to_key(self.compare_pages)
         total_valid_medians = 0
         for u in self.manual_updates:
             if not self.is_update_valid(u):
-                u_copy = u.copy()
-                while True:
-                    invalid = False
-                    for oi, i in enumerate(u_copy[::-1]):
-                        for ni, j in enumerate(u_copy[: len(u_copy) - (oi + 1)]):
-                            if j in self.printing_rules[i]:
-                                invalid = True
-                                break
-
-                        if invalid:
-                            break
-
-                    if invalid:
-                        u_copy.pop(len(u_copy) - (oi + 1))
-                        u_copy = [i, *u_copy] if ni == 0 else [*u_copy[:ni], i, *u_copy[ni:]]
-                    else:
-                        break
-
-                total_valid_medians += int(u_copy[int(len(u_copy) / 2)])
+                ordered = sorted(u, key=key)
+                total_valid_medians += page_numbers[ordered[len(ordered) // 2]]
+
         return total_valid_medians
 
 
@@ -1,12 +1,17 @@
+import random
+from bisect import bisect_left, bisect_right
 from enum import Enum
-from typing import List, Optional, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-from utils import Problem, ProblemRunner
+from utils import Grid, InputMode, Problem, ProblemRunner
 
 
 class Problem2024Day06(Problem):
     """Solution to 2024/problems/06.md"""
 
+    input_mode = InputMode.STREAM
+    scaling_sizes = (50, 100, 200)
+
     class Direction(Enum):
         """Represents the direction of the guard"""
 
@@ -38,84 +43,151 @@ class Problem2024Day06(Problem):
 
             raise ValueError(f"Invalid Direction: {s}")
 
+    CLOCKWISE = (Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST)
+    """The directions in the order the guard turns through them, the index of a direction is its integer encoding"""
+
+    HORIZONTAL = (False, True, False, True)
+    """Whether the guard walks along a row (rather than a column) in every encoded direction"""
+
+    FORWARD = (False, True, True, False)
+    """Whether the guard walks towards increasing coordinates in every encoded direction"""
+
     def __init__(self):
         """Parses the input into the following attributes:
 
-        1. mapping of row number to a list of all column numbers that contain obstacles
-        2. mapping of col number to a list of all row numbers that contain obstacles
+        1. mapping of row number to a sorted list of all column numbers that contain obstacles
+        2. mapping of col number to a sorted list of all row numbers that contain obstacles
         3. the max column number
         4. the max row number
         5. the initial location and direction of the guard
+
+        The guard state is also encoded as a single integer, (y * width + x) * 4 + direction, which indexes a bitmap of
+        visited states.
         """
         super().__init__()
+        self.grid = Grid.from_lines(self.iter_input_lines())
         self.row_obstacles = {}
         self.col_obstacles = {}
-        self.max_y = len(self.lines)
-        self.max_x = len(self.lines[0])
-        directional_chars = Problem2024Day06.Direction.get_directional_chars()
-        for row, line in enumerate(self.lines):
-            for col, char in enumerate(line):
-                if char == "#":
-                    self.row_obstacles[row] = self.row_obstacles.get(row, [])
-                    self.row_obstacles[row].append(col)
-
-                    self.col_obstacles[col] = self.col_obstacles.get(col, [])
-                    self.col_obstacles[col].append(row)
-                elif char in directional_chars:
-                    self.initial_guard_location = (col, row), Problem2024Day06.Direction.from_str(char)
-
-    @staticmethod
-    def finalize_path_segment(
-        path_segment: List[Tuple[Tuple[int, int], "Problem2024Day06.Direction"]],
-        guard_path: List[Tuple[Tuple[int, int], "Problem2024Day06.Direction"]],
-        guard_path_set: Set[Tuple[Tuple[int, int], "Problem2024Day06.Direction"]],
-    ) -> bool:
-        """Checks to see if the current path segment contains a (location and direction) that has already been traversed
-        by the guard.  If so it returns True to mark this path as an infinite loop. If the path segment does not create
-        an infinite loop then each location in the path segment is added to the guard_path and guard_path_set.
-
-        :param path_segment: the path segment to check
-        :param guard_path: the complete guard path to this point
-        :param guard_path_set: the set of all (locations with directions) in the guard path
-        :return: True if the path segment is an infinite loop, False otherwise
+        self.max_y = self.grid.height
+        self.max_x = self.grid.width
+        for index in self.grid.find_all(b"#"):
+            col, row = self.grid.coords(index)
+            self.row_obstacles.setdefault(row, []).append(col)
+            self.col_obstacles.setdefault(col, []).append(row)
+
+        for char in Problem2024Day06.Direction.get_directional_chars():
+            index = next(self.grid.find_all(char.encode()), None)
+            if index is not None:
+                self.initial_guard_location = self.grid.coords(index), Problem2024Day06.Direction.from_str(char)
+
+        self.obstacle_lines = (self.col_obstacles, self.row_obstacles, self.col_obstacles, self.row_obstacles)
+        self.steps = (-self.max_x, 1, self.max_x, -1)
+        self.initial_guard_state = self.encode(*self.initial_guard_location)
+        self.visited = bytearray(self.max_x * self.max_y * 4)
+        self.generation = 0
+
+    @classmethod
+    def generate_input(cls, size: int, rng: random.Random) -> Iterator[str]:
+        """Generates a `size` x `size` map where roughly 5% of the positions are obstructed and the guard starts in the
+        middle of the map facing north.
+
+        :param size: the width and height of the map
+        :param rng: the seeded random number generator
+        :return: the lines of the input
         """
-        for location in path_segment:
-            if location in guard_path_set:
-                return True
+        for y in range(size):
+            row = ["#" if rng.random() < 0.05 else "." for _ in range(size)]
+            if y == size // 2:
+                row[size // 2] = "^"
+
+            yield "".join(row)
+
+    def encode(self, coords: Tuple[int, int], direction: "Problem2024Day06.Direction") -> int:
+        """Encodes a guard state into a single integer.
+
+        :param coords: the location of the guard
+        :param direction: the direction of the guard
+        :return: the encoded state
+        """
+        return (coords[1] * self.max_x + coords[0]) * 4 + Problem2024Day06.CLOCKWISE.index(direction)
+
+    def walk(self, start: int, extra_obstacle: Optional[int] = None) -> Tuple[List[int], bool]:
+        """Walks the guard from obstacle to obstacle. The next obstacle is found by bisecting the sorted row or column
+        obstacles and the extra obstacle is compared against it. The guard is in an infinite loop as soon as it turns
+        at the same location in the same direction twice, which is tracked in the visited bitmap: every walk stamps
+        the states it visits with a new generation, so the bitmap only has to be cleared when the generation wraps.
+
+        :param start: the encoded initial state of the guard
+        :param extra_obstacle: the index of the extra obstacle to add
+        :return: a tuple of the encoded turns of the guard (starting with the initial state) and a boolean indicating
+            if the guard path is an infinite loop
+        """
+        width = self.max_x
+        horizontal, forward, obstacle_lines = Problem2024Day06.HORIZONTAL, Problem2024Day06.FORWARD, self.obstacle_lines
+        extra_y, extra_x = divmod(extra_obstacle, width) if extra_obstacle is not None else (-1, -1)
+        self.generation += 1
+        if self.generation > 255:
+            self.visited[:] = bytes(len(self.visited))
+            self.generation = 1
+
+        generation, visited = self.generation, self.visited
+        visited[start] = generation
+        turns = [start]
+        state = start
+        while True:
+            cell, direction = divmod(state, 4)
+            y, x = divmod(cell, width)
+            if horizontal[direction]:
+                line, position, extra = y, x, extra_x if extra_y == y else -1
             else:
-                guard_path.append(location)
-                guard_path_set.add(location)
-
-        return False
-
-    def add_extra_obstacle(
-        self,
-        guard_coords: Tuple[int, int],
-        guard_direction: "Problem2024Day06.Direction",
-        extra_obstacle: Optional[Tuple[int, int]] = None,
-    ) -> List[int]:
-        """Returns a copied version of the row or column obstacles with the request extra obstacle if it makes sense to
-        do so, otherwise the current row or column obstacles are returned.
-
-        :param guard_coords: the current guard location
-        :param guard_direction: the current guard direction
-        :param extra_obstacle: the extra obstacle to add
-        :return: the list of obstacles
+                line, position, extra = x, y, extra_y if extra_x == x else -1
+
+            obstacles = obstacle_lines[direction].get(line, ())
+            if forward[direction]:
+                i = bisect_right(obstacles, position)
+                obstacle = obstacles[i] if i < len(obstacles) else -1
+                if extra > position and (obstacle < 0 or extra < obstacle):
+                    obstacle = extra
+
+                stop = obstacle - 1
+            else:
+                i = bisect_left(obstacles, position)
+                obstacle = obstacles[i - 1] if i > 0 else -1
+                if position > extra > obstacle:
+                    obstacle = extra
+
+                stop = obstacle + 1
+
+            if obstacle < 0:
+                return turns, False
+
+            state = ((line * width + stop if horizontal[direction] else stop * width + line) << 2) | (direction + 1) % 4
+            if visited[state] == generation:
+                return turns, True
+
+            visited[state] = generation
+            turns.append(state)
+
+    def trace(self, turns: List[int], looping_path: bool) -> Iterator[Tuple[int, int]]:
+        """Expands the turns of a walk into every step of the guard.
+
+        :param turns: the encoded turns of the guard, starting with the initial state
+        :param looping_path: whether the walk is an infinite loop
+        :return: an iterator of the index of the location entered by every step and the encoded direction of that step
         """
-        if guard_direction in (Problem2024Day06.Direction.WEST, Problem2024Day06.Direction.EAST):
-            obstacles = self.row_obstacles.get(guard_coords[1], [])
-            if extra_obstacle is not None and extra_obstacle[1] == guard_coords[1]:
-                obstacles = obstacles.copy()
-                obstacles.append(extra_obstacle[0])
-                obstacles.sort()
-        else:
-            obstacles = self.col_obstacles.get(guard_coords[0], [])
-            if extra_obstacle is not None and extra_obstacle[0] == guard_coords[0]:
-                obstacles = obstacles.copy()
-                obstacles.append(extra_obstacle[1])
-                obstacles.sort()
-
-        return obstacles
+        for i, state in enumerate(turns):
+            cell, direction = divmod(state, 4)
+            step = self.steps[direction]
+            if i + 1 < len(turns):
+                count = ((turns[i + 1] >> 2) - cell) // step
+            elif looping_path:
+                break
+            else:
+                y, x = divmod(cell, self.max_x)
+                count = (y, self.max_x - 1 - x, self.max_y - 1 - y, x)[direction]
+
+            for j in range(1, count + 1):
+                yield cell + step * j, direction
 
     def calculate_guard_path(
         self, extra_obstacle: Optional[Tuple[int, int]] = None
@@ -125,95 +197,38 @@ class Problem2024Day06(Problem):
         :param extra_obstacle: the extra obstacle to add
         :return: a tuple of the guard path and a boolean indicating if the guard path is an infinite loop
         """
-        guard_path = [self.initial_guard_location]
-        guard_path_set = set(self.initial_guard_location)
-        looping_path = False
-        while True:
-            guard_coords, guard_direction = guard_path[-1]
-            if guard_direction == Problem2024Day06.Direction.WEST:
-                obstacles = self.add_extra_obstacle(guard_coords, guard_direction, extra_obstacle)
-                obstacle = next((x for x in obstacles[::-1] if x < guard_coords[0]), None)
-                if obstacle is not None:
-                    path_segment = [
-                        ((x, guard_coords[1]), Problem2024Day06.Direction.WEST)
-                        for x in range(guard_coords[0] - 1, obstacle + 1, -1)
-                    ]
-                    path_segment.append(((obstacle + 1, guard_coords[1]), Problem2024Day06.Direction.NORTH))
-                    if self.finalize_path_segment(path_segment, guard_path, guard_path_set, extra_obstacle):
-                        looping_path = True
-                        break
-                else:
-                    guard_path.extend(
-                        [
-                            ((x, guard_coords[1]), Problem2024Day06.Direction.WEST)
-                            for x in range(guard_coords[0] - 1, -1, -1)
-                        ]
-                    )
-                    break
-            elif guard_direction == Problem2024Day06.Direction.EAST:
-                obstacles = self.add_extra_obstacle(guard_coords, guard_direction, extra_obstacle)
-                obstacle = next((x for x in obstacles if x > guard_coords[0]), None)
-                if obstacle is not None:
-                    path_segment = [
-                        ((x, guard_coords[1]), Problem2024Day06.Direction.EAST)
-                        for x in range(guard_coords[0] + 1, obstacle - 1)
-                    ]
-                    path_segment.append(((obstacle - 1, guard_coords[1]), Problem2024Day06.Direction.SOUTH))
-                    if self.finalize_path_segment(path_segment, guard_path, guard_path_set, extra_obstacle):
-                        looping_path = True
-                        break
-                else:
-                    guard_path.extend(
-                        [
-                            ((x, guard_coords[1]), Problem2024Day06.Direction.EAST)
-                            for x in range(guard_coords[0] + 1, self.max_x)
-                        ]
-                    )
-                    break
-            elif guard_direction == Problem2024Day06.Direction.NORTH:
-                obstacles = self.add_extra_obstacle(guard_coords, guard_direction, extra_obstacle)
-                obstacle = next((y for y in obstacles[::-1] if y < guard_coords[1]), None)
-                if obstacle is not None:
-                    path_segment = [
-                        ((guard_coords[0], y), Problem2024Day06.Direction.NORTH)
-                        for y in range(guard_coords[1] - 1, obstacle + 1, -1)
-                    ]
-                    path_segment.append(((guard_coords[0], obstacle + 1), Problem2024Day06.Direction.EAST))
-                    if self.finalize_path_segment(path_segment, guard_path, guard_path_set, extra_obstacle):
-                        looping_path = True
-                        break
-                else:
-                    guard_path.extend(
-                        [
-                            ((guard_coords[0], y), Problem2024Day06.Direction.NORTH)
-                            for y in range(guard_coords[1] - 1, -1, -1)
-                        ]
-                    )
-                    break
-            elif guard_direction == Problem2024Day06.Direction.SOUTH:
-                obstacles = self.add_extra_obstacle(guard_coords, guard_direction, extra_obstacle)
-                obstacle = next((y for y in obstacles if y > guard_coords[1]), None)
-                if obstacle is not None:
-                    path_segment = [
-                        ((guard_coords[0], y), Problem2024Day06.Direction.SOUTH)
-                        for y in range(guard_coords[1] + 1, obstacle - 1)
-                    ]
-                    path_segment.append(((guard_coords[0], obstacle - 1), Problem2024Day06.Direction.WEST))
-                    if self.finalize_path_segment(path_segment, guard_path, guard_path_set, extra_obstacle):
-                        looping_path = True
-                        break
-                else:
-                    guard_path.extend(
-                        [
-                            ((guard_coords[0], y), Problem2024Day06.Direction.SOUTH)
-                            for y in range(guard_coords[1] + 1, self.max_y)
-                        ]
-                    )
-                    break
-            else:
-                raise ValueError(f"Invalid Direction: {guard_direction}")
+        extra_cell = None if extra_obstacle is None else extra_obstacle[1] * self.max_x + extra_obstacle[0]
+        turns, looping_path = self.walk(self.initial_guard_state, extra_cell)
+        cells = [self.initial_guard_state >> 2, *(cell for cell, _ in self.trace(turns, looping_path))]
+        return [(cell % self.max_x, cell // self.max_x) for cell in cells], looping_path
+
+    def find_candidates(self) -> Dict[int, int]:
+        """Finds the locations of the guard path where an extra obstacle could be placed, along with the state of the
+        guard just before it first reaches them. The path up to that state does not change when the obstacle is
+        placed, so the loop search can resume from there instead of the initial state.
+
+        :return: a mapping of the index of every candidate location to the encoded state of the guard just before
+            reaching it
+        """
+        start = self.initial_guard_state >> 2
+        candidates = {}
+        previous = start
+        for cell, direction in self.trace(*self.walk(self.initial_guard_state)):
+            if cell != start and cell not in candidates:
+                candidates[cell] = previous * 4 + direction
+
+            previous = cell
 
-        return [path_segment[0] for path_segment in guard_path], looping_path
+        return candidates
+
+    def count_loops(self, candidates: List[Tuple[int, int]]) -> int:
+        """Counts the candidate obstacles that trick the guard into a looping path.
+
+        :param candidates: the indexes of the candidate locations with the encoded state of the guard just before
+            reaching them
+        :return: the number of candidates that create a loop
+        """
+        return sum(1 for cell, start in candidates if self.walk(start, cell)[1])
 
     def part_one(self) -> int:
         """Finds all the coordinates that the guard traverses along their predetermined path.
@@ -224,18 +239,14 @@ class Problem2024Day06(Problem):
 
     def part_two(self) -> int:
         """Finds all the possible coordinates where a single obstacle can be placed that would trick the guard to get
-        caught in a looping path.
+        caught in a looping path. The candidates are split across a pool of `workers` processes.
 
         :return: the total number of possible coordinates
         """
-        loop_obstacles = set()
-        for coords in self.calculate_guard_path()[0][1:]:
-            if coords not in loop_obstacles:
-                guard_path, is_loop = self.calculate_guard_path(coords)
-                if is_loop:
-                    loop_obstacles.add(coords)
-
-        return len(loop_obstacles)
+        candidates = list(self.find_candidates().items())
+        num_chunks = self.workers * 4
+        chunks = [(candidates[i::num_chunks],) for i in range(num_chunks)]
+        return sum(self.map_forked(Problem2024Day06.count_loops, chunks))
 
 
 if __name__ == "__main__":
@@ -1,21 +1,44 @@
+import random
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Set
+from typing import Iterator, List, Optional, Set
 
-from utils import Problem, ProblemRunner
+from utils import InputMode, Problem, ProblemRunner
 
 
 class Problem2024Day07(Problem):
     """Solution to 2024/problems/07.md"""
 
+    input_mode = InputMode.STREAM
+    scaling_sizes = (5, 10, 15, 20, 25)
+    chunk_size = 100
+
     def __init__(self):
         """Parses the problem input into a list of tuples of target result to list of constants."""
         super().__init__()
         self.parsed_lines = [
             (int(split[0]), [int(i) for i in split[1].strip().split()])
-            for split in [line.split(":") for line in self.lines]
+            for split in (line.split(":") for line in self.iter_input_lines())
         ]
 
+    @classmethod
+    def generate_input(cls, size: int, rng: random.Random) -> Iterator[str]:
+        """Generates 100 equations of `size` constants. Half of the equations are solvable with random operators and
+        the other half are most likely not.
+
+        :param size: the number of constants per equation
+        :param rng: the seeded random number generator
+        :return: the lines of the input
+        """
+        operators = list(cls.Operator)
+        for i in range(100):
+            constants = [rng.randint(1, 99) for _ in range(size)]
+            result = constants[0]
+            for constant in constants[1:]:
+                result = rng.choice(operators).evaluate(result, constant)
+
+            yield f"{result if i % 2 == 0 else result + 1}: {' '.join(str(c) for c in constants)}"
+
     class Operator(Enum):
         """Represents possible operators."""
 
@@ -35,10 +58,42 @@ class Problem2024Day07(Problem):
             elif self == Problem2024Day07.Operator.MULTIPLY:
                 return left * right
             elif self == Problem2024Day07.Operator.CONCATENATION:
-                return int(f"{left}{right}")
+                return left * Problem2024Day07.Operator.decimal_shift(right) + right
+
+            raise NotImplementedError(f"Operator: {self.name}")
+
+        def invert(self, result: int, right: int) -> Optional[int]:
+            """Finds the left constant that evaluates to the result with the right constant, i.e. subtracts, divides
+            exactly or removes the decimal suffix. A zero right constant can not be divided out, a multiplication by
+            zero has to be handled by the caller.
+
+            :param result: the result of the operation
+            :param right: the right constant
+            :return: the left constant, or None if no non-negative left constant evaluates to the result
+            """
+            if self == Problem2024Day07.Operator.ADD:
+                return result - right if result >= right else None
+            elif self == Problem2024Day07.Operator.MULTIPLY:
+                return result // right if right != 0 and result % right == 0 else None
+            elif self == Problem2024Day07.Operator.CONCATENATION:
+                shift = Problem2024Day07.Operator.decimal_shift(right)
+                return result // shift if result % shift == right else None
 
             raise NotImplementedError(f"Operator: {self.name}")
 
+        @staticmethod
+        def decimal_shift(constant: int) -> int:
+            """Finds the power of 10 that shifts a number left by the number of digits of the constant.
+
+            :param constant: the non-negative constant
+            :return: the power of 10
+            """
+            shift = 10
+            while shift <= constant:
+                shift *= 10
+
+            return shift
+
     @dataclass
     class EquationSolver:
         """Dataclass that tries to solve possible equations."""
@@ -49,34 +104,65 @@ class Problem2024Day07(Problem):
         is_valid: bool = field(init=False)
 
         def __post_init__(self) -> None:
-            """Tries to solve the equation."""
-            possible_results = {self.constants[0]}
-            for num in self.constants[1:]:
-                next_possible_results = set()
-                for current_result in possible_results:
-                    for op in self.possible_operators:
-                        next_possible_results.add(op.evaluate(current_result, num))
-
-                possible_results = next_possible_results
-
-            self.is_valid = self.target_result in possible_results
+            """Tries to solve the equation backwards from the target result: every operator is inverted against the last
+            constant, and a branch is pruned as soon as the inversion is impossible. The equation is valid if a branch
+            ends with the first constant.
+            """
+            self.is_valid = False
+            constants = self.constants
+            multiply = Problem2024Day07.Operator.MULTIPLY
+            stack = [(self.target_result, len(constants) - 1)]
+            while stack:
+                result, index = stack.pop()
+                if index == 0:
+                    if result == constants[0]:
+                        self.is_valid = True
+                        return
+
+                    continue
+
+                right = constants[index]
+                for op in self.possible_operators:
+                    if op == multiply and right == 0:
+                        if result == 0:
+                            # any left side evaluates to 0, and the constants before always evaluate to something
+                            self.is_valid = True
+                            return
+
+                        continue
+
+                    left = op.invert(result, right)
+                    if left is not None:
+                        stack.append((left, index - 1))
+
+    def solve_chunk(self, start: int, stop: int, possible_operators: Set["Problem2024Day07.Operator"]) -> int:
+        """Tries to solve a chunk of the equations with the given set of possible operators.
+
+        :param start: the index of the first equation of the chunk
+        :param stop: the index after the last equation of the chunk
+        :param possible_operators: the possible operator set
+        :return: summation of the results of the valid equations of the chunk
+        """
+        return sum(
+            target_result
+            for target_result, constants in self.parsed_lines[start:stop]
+            if Problem2024Day07.EquationSolver(
+                target_result=target_result, constants=constants, possible_operators=possible_operators
+            ).is_valid
+        )
 
     def solve_for_operators(self, possible_operators: Set["Problem2024Day07.Operator"]) -> int:
-        """Tries to solve all possible equations with the given set of possible operators.
+        """Tries to solve all possible equations with the given set of possible operators. The equations are split into
+        chunks of `chunk_size` across a pool of `workers` processes, which only return the partial sum of their chunk.
 
         :param possible_operators: the possible operator set
         :return: summation of the results of all valid equations
         """
-        return sum(
-            eq.target_result
-            for eq in [
-                Problem2024Day07.EquationSolver(
-                    target_result=target_result, constants=constants, possible_operators=possible_operators
-                )
-                for target_result, constants in self.parsed_lines
-            ]
-            if eq.is_valid
-        )
+        chunks = [
+            (start, start + self.chunk_size, possible_operators)
+            for start in range(0, len(self.parsed_lines), self.chunk_size)
+        ]
+        return sum(self.map_forked(Problem2024Day07.solve_chunk, chunks))
 
     def part_one(self) -> int:
         """Calculates the summation of the results for all valid equations with only the ADD and MULTIPLY operators.
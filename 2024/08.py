@@ -1,26 +1,122 @@
-from typing import Set
+import math
+import random
+import string
+from array import array
+from itertools import combinations
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Set, Tuple
 
-from utils import Point, Problem, ProblemRunner
+from utils import Grid, InputMode, Point, Problem, ProblemRunner, import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Problem2024Day08(Problem):
     """Solution to 2024/problems/08.md"""
 
+    input_mode = InputMode.STREAM
+    scaling_sizes = (50, 100, 200, 400)
+    engines = ("python", "numpy", "incremental")
+
+    class AntinodeIndex:
+        """Maintains the distinct antinodes of a changing set of antennas. Every antinode cell keeps a reference count
+        of the antenna pairs that produce it, so adding or removing an antenna only touches the pairs of its frequency
+        that involve it, and the number of distinct antinodes is always known.
+        """
+
+        def __init__(self, problem: "Problem2024Day08", resonant_harmonics=False):
+            """Indexes the antennas of the problem.
+
+            :param problem: the problem that defines the grid and the initial antennas
+            :param resonant_harmonics: True if resonant harmonics should be included, False otherwise
+            """
+            self.problem = problem
+            self.resonant_harmonics = resonant_harmonics
+            self.antennas = {}
+            self.reference_counts = array("I", bytes(4 * problem.oob_x * problem.oob_y))
+            self.num_antinodes = 0
+            for frequency, locations in problem.antenna_locations.items():
+                for location in locations:
+                    self.add(frequency, location)
+
+        def update_pairs(self, frequency: str, location: Point, delta: int) -> None:
+            """Adds or removes the antinodes of every pair of an antenna with the other antennas of its frequency.
+
+            :param frequency: the frequency of the antenna
+            :param location: the location of the antenna
+            :param delta: 1 to add the antinodes, -1 to remove them
+            """
+            reference_counts = self.reference_counts
+            for other_location in self.antennas[frequency]:
+                if other_location == location:
+                    continue
+
+                for cell in self.problem.antinode_cells(location, other_location, self.resonant_harmonics):
+                    count = reference_counts[cell]
+                    reference_counts[cell] = count + delta
+                    if count == 0:
+                        self.num_antinodes += 1
+                    elif count + delta == 0:
+                        self.num_antinodes -= 1
+
+        def add(self, frequency: str, location: Point) -> None:
+            """Adds an antenna to the index.
+
+            :param frequency: the frequency of the antenna
+            :param location: the location of the antenna
+            """
+            if not self.problem.is_point_on_grid(location):
+                raise ValueError(f"Antenna is not on the grid: {location}")
+
+            locations = self.antennas.setdefault(frequency, set())
+            if location in locations:
+                raise ValueError(f"Duplicate antenna: {frequency} at {location}")
+
+            locations.add(location)
+            self.update_pairs(frequency, location, 1)
+
+        def remove(self, frequency: str, location: Point) -> None:
+            """Removes an antenna from the index.
+
+            :param frequency: the frequency of the antenna
+            :param location: the location of the antenna
+            """
+            if location not in self.antennas.get(frequency, ()):
+                raise ValueError(f"Unknown antenna: {frequency} at {location}")
+
+            self.update_pairs(frequency, location, -1)
+            self.antennas[frequency].remove(location)
+
+        def __len__(self) -> int:
+            """Returns the number of distinct antinode locations."""
+            return self.num_antinodes
+
     def __init__(self):
         """Identifies all antenna locations."""
         super().__init__()
+        self.grid = Grid.from_lines(self.iter_input_lines())
 
         self.antenna_locations = {}
-        for y, line in enumerate(self.lines[::-1]):
-            for x, c in enumerate(line):
-                if c == ".":
-                    continue
+        for c in set(self.grid.data) - {ord(".")}:
+            self.antenna_locations[chr(c)] = [
+                Point(x, self.grid.height - 1 - y) for x, y in map(self.grid.coords, self.grid.find_all(c))
+            ]
 
-                self.antenna_locations[c] = self.antenna_locations.get(c, [])
-                self.antenna_locations[c].append(Point(x, y))
+        self.oob_x = self.grid.width
+        self.oob_y = self.grid.height
 
-        self.oob_x = len(self.lines[0])
-        self.oob_y = len(self.lines)
+    @classmethod
+    def generate_input(cls, size: int, rng: random.Random) -> Iterator[str]:
+        """Generates a `size` x `size` map where roughly 2% of the positions contain an antenna of one of 62
+        frequencies.
+
+        :param size: the width and height of the map
+        :param rng: the seeded random number generator
+        :return: the lines of the input
+        """
+        frequencies = string.digits + string.ascii_letters
+        for _ in range(size):
+            yield "".join(rng.choice(frequencies) if rng.random() < 0.02 else "." for _ in range(size))
 
     def is_point_on_grid(self, point: Point) -> bool:
         """Determines whether a point is on the grid.
@@ -30,6 +126,38 @@ class Problem2024Day08(Problem):
         """
         return 0 <= point.x < self.oob_x and 0 <= point.y < self.oob_y
 
+    @staticmethod
+    def multiples_on_axis(position: int, step: int, size: int) -> Tuple[float, float]:
+        """Finds the range of multiples k that keep position + k * step in [0, size).
+
+        :param position: the coordinate of the starting point on the axis
+        :param step: the step on the axis
+        :param size: the size of the grid on the axis
+        :return: the inclusive range of multiples, unbounded if the step is 0
+        """
+        if step > 0:
+            return -(position // step), (size - 1 - position) // step
+        elif step < 0:
+            return -((size - 1 - position) // -step), position // -step
+
+        return -math.inf, math.inf
+
+    def resonant_lattice(self, p1: Point, p2: Point) -> Tuple[int, int, int, int]:
+        """Finds the grid positions exactly in line with a pair of antennas: the step between the antennas is reduced
+        by the gcd of its coordinates, and the on-grid range of its multiples is computed in closed form.
+
+        :param p1: the first antenna location
+        :param p2: the second antenna location
+        :return: the x and y of the reduced step, and the inclusive range of multiples of the step from p1 that are on
+            the grid
+        """
+        step_x, step_y = p1.x - p2.x, p1.y - p2.y
+        divisor = math.gcd(step_x, step_y)
+        step_x, step_y = step_x // divisor, step_y // divisor
+        min_x, max_x = self.multiples_on_axis(p1.x, step_x, self.oob_x)
+        min_y, max_y = self.multiples_on_axis(p1.y, step_y, self.oob_y)
+        return step_x, step_y, int(max(min_x, min_y)), int(min(max_x, max_y))
+
     def calculate_antinodes(self, p1: Point, p2: Point, resonant_harmonics=False) -> Set[Point]:
         """Calculates the all antinode locations for a pair of antenna locations.
 
@@ -38,33 +166,90 @@ class Problem2024Day08(Problem):
         :param resonant_harmonics: True if resonant harmonics should be included, False otherwise
         :return: the set of all antinode locations
         """
-        distance_x, distance_y = p1.calculate_distance(p2)
-        antinodes = set()
-
         if resonant_harmonics:
-            antinodes.update({p1, p2})
+            step_x, step_y, first, last = self.resonant_lattice(p1, p2)
+            return {Point(p1.x + step_x * k, p1.y + step_y * k) for k in range(first, last + 1)}
 
-            last_antinode = p1
-            while True:
-                last_antinode = Point(last_antinode.x + distance_x, last_antinode.y + distance_y)
-                if not self.is_point_on_grid(last_antinode):
-                    break
+        distance = p1.calculate_distance(p2)
+        return {antinode for antinode in (p1 + distance, p2 - distance) if self.is_point_on_grid(antinode)}
 
-                antinodes.add(last_antinode)
+    def antinode_cells(self, p1: Point, p2: Point, resonant_harmonics=False) -> Iterable[int]:
+        """Calculates the flat cells of the antinode locations for a pair of antenna locations. The resonant antinodes
+        are evenly spaced in the flat grid, so they are a range over the lattice of the pair.
 
-            last_antinode = p2
-            while True:
-                last_antinode = Point(last_antinode.x - distance_x, last_antinode.y - distance_y)
-                if not self.is_point_on_grid(last_antinode):
-                    break
+        :param p1: the first antenna location
+        :param p2: the second antenna location
+        :param resonant_harmonics: True if resonant harmonics should be included, False otherwise
+        :return: the distinct cells of the antinodes, indexed by y * width + x
+        """
+        if not resonant_harmonics:
+            dx, dy = p1.x - p2.x, p1.y - p2.y
+            return [
+                y * self.oob_x + x
+                for x, y in ((p1.x + dx, p1.y + dy), (p2.x - dx, p2.y - dy))
+                if 0 <= x < self.oob_x and 0 <= y < self.oob_y
+            ]
 
-                antinodes.add(last_antinode)
-        else:
-            for antinode in {Point(p1.x + distance_x, p1.y + distance_y), Point(p2.x - distance_x, p2.y - distance_y)}:
-                if self.is_point_on_grid(antinode):
-                    antinodes.add(antinode)
+        step_x, step_y, first, last = self.resonant_lattice(p1, p2)
+        stride = step_y * self.oob_x + step_x
+        start = p1.y * self.oob_x + p1.x
+        return range(start + stride * first, start + stride * (last + 1), stride)
 
-        return antinodes
+    def mark_antinodes(self, bitmap: bytearray, p1: Point, p2: Point, resonant_harmonics=False) -> None:
+        """Marks the antinode locations for a pair of antenna locations in a flat bitmap of the grid. The resonant
+        antinodes are evenly spaced in the flat bitmap, so they are marked with a single strided slice assignment.
+
+        :param bitmap: the bitmap with one byte per grid position, indexed by y * width + x
+        :param p1: the first antenna location
+        :param p2: the second antenna location
+        :param resonant_harmonics: True if resonant harmonics should be included, False otherwise
+        """
+        if not resonant_harmonics:
+            dx, dy = p1.x - p2.x, p1.y - p2.y
+            for x, y in ((p1.x + dx, p1.y + dy), (p2.x - dx, p2.y - dy)):
+                if 0 <= x < self.oob_x and 0 <= y < self.oob_y:
+                    bitmap[y * self.oob_x + x] = 1
+            return
+
+        step_x, step_y, first, last = self.resonant_lattice(p1, p2)
+        stride = step_y * self.oob_x + step_x
+        start = (p1.y + step_y * first) * self.oob_x + p1.x + step_x * first
+        count = last - first + 1
+        if stride < 0:
+            start, stride = start + stride * (count - 1), -stride
+
+        bitmap[start : start + stride * (count - 1) + 1 : stride] = b"\x01" * count
+
+    def count_frequency_batch(self, bitmap: "np.ndarray", locations: List[Point], resonant_harmonics=False) -> None:
+        """Marks the antinode locations of every pair of antennas of one frequency at once with vectorized pairs.
+
+        :param bitmap: the boolean bitmap of the grid, indexed by y * width + x
+        :param locations: the antenna locations of the frequency
+        :param resonant_harmonics: True if resonant harmonics should be included, False otherwise
+        """
+        np = import_numpy()
+        points = np.array(locations, dtype=np.int64).reshape(-1, 2)
+        i, j = np.triu_indices(len(points), k=1)
+        starts, distances = points[i], points[i] - points[j]
+        size = np.array([self.oob_x, self.oob_y])
+        if not resonant_harmonics:
+            antinodes = np.concatenate((starts + distances, points[j] - distances))
+            antinodes = antinodes[((antinodes >= 0) & (antinodes < size)).all(axis=1)]
+            bitmap[antinodes[:, 1] * self.oob_x + antinodes[:, 0]] = True
+            return
+
+        steps = distances // np.gcd(distances[:, 0], distances[:, 1])[:, None]
+        # for every axis: 0 <= start + k * step < size, unbounded where the step is 0
+        safe_steps = np.where(steps == 0, 1, steps)
+        low = np.where(steps > 0, -(starts // safe_steps), -((size - 1 - starts) // -safe_steps))
+        high = np.where(steps > 0, (size - 1 - starts) // safe_steps, starts // -safe_steps)
+        first = np.where(steps == 0, np.iinfo(np.int64).min, low).max(axis=1)
+        last = np.where(steps == 0, np.iinfo(np.int64).max, high).min(axis=1)
+        counts = last - first + 1
+        pairs = np.repeat(np.arange(len(counts)), counts)
+        multiples = first[pairs] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        antinodes = starts[pairs] + steps[pairs] * multiples[:, None]
+        bitmap[antinodes[:, 1] * self.oob_x + antinodes[:, 0]] = True
 
     def calculate_num_antinodes(self, resonant_harmonics=False) -> int:
         """Calculates the total number of antinode locations on the grid.
@@ -72,19 +257,25 @@ class Problem2024Day08(Problem):
         :param resonant_harmonics: True if resonant harmonics should be included, False otherwise
         :return: the total number of antinode locations on the grid
         """
-        antinodes = set()
-        for signal, locations in self.antenna_locations.items():
-            for i, location in enumerate(locations[:-1]):
-                for other_location in locations[i + 1 :]:
-                    if location != other_location:
-                        antinodes.update(
-                            {
-                                antinode
-                                for antinode in self.calculate_antinodes(location, other_location, resonant_harmonics)
-                            }
-                        )
-
-        return len(antinodes)
+        if self.engine == "incremental":
+            return len(self.AntinodeIndex(self, resonant_harmonics))
+
+        if self.engine == "numpy":
+            np = import_numpy()
+            bitmap = np.zeros(self.oob_x * self.oob_y, dtype=bool)
+            for locations in self.antenna_locations.values():
+                if len(locations) > 1:
+                    self.count_frequency_batch(bitmap, locations, resonant_harmonics)
+
+            return int(bitmap.sum())
+
+        bitmap = bytearray(self.oob_x * self.oob_y)
+        for locations in self.antenna_locations.values():
+            for location, other_location in combinations(locations, 2):
+                if location != other_location:
+                    self.mark_antinodes(bitmap, location, other_location, resonant_harmonics)
+
+        return bitmap.count(1)
 
     def part_one(self) -> int:
         """Calculates the total number of antinode locations on the grid without resonant harmonics."""
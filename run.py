@@ -0,0 +1,4 @@
+from utils import SuiteRunner
+
+if __name__ == "__main__":
+    SuiteRunner.main()
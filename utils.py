@@ -1,8 +1,50 @@
+import argparse
+import ast
+import concurrent.futures
+import cProfile
+import gc
+import glob
+import hashlib
+import importlib.util
+import inspect
+import json
+import math
+import multiprocessing
+import operator
 import os
+import pickle
+import platform
+import pstats
+import random
+import shlex
+import statistics
+import subprocess
 import sys
+import tempfile
 import time
-from contextlib import contextmanager
-from typing import Generator, List, Type
+import traceback
+import tracemalloc
+from array import array
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from enum import Enum
+from itertools import repeat
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_numpy():
+    """Imports numpy on demand, so that only the numpy engines pay for importing it.
+
+    :return: the numpy module
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("The numpy engines require numpy to be installed") from e
+
+    return numpy
 
 
 class Timed:
@@ -10,23 +52,376 @@ class Timed:
 
     def __init__(self):
         self.execution_time = None
+        self.execution_time_ns = None
 
     @contextmanager
     def start(self) -> Generator["Timed", None, None]:
-        start = time.time() * 1000
+        start = time.perf_counter_ns()
         try:
             yield self
         finally:
-            self.execution_time = round(time.time() * 1000 - start, 5)
+            self.execution_time_ns = time.perf_counter_ns() - start
+            self.execution_time = round(self.execution_time_ns / 1_000_000, 5)
+
+    @staticmethod
+    def from_ns(execution_time_ns: int) -> "Timed":
+        """Creates a timing from a duration measured elsewhere, e.g. in another process.
+
+        :param execution_time_ns: the duration in nanoseconds
+        :return: the timing
+        """
+        timed = Timed()
+        timed.execution_time_ns = execution_time_ns
+        timed.execution_time = round(execution_time_ns / 1_000_000, 5)
+        return timed
 
     @staticmethod
     def sum(*timed: "Timed") -> float:
         return round(sum((t.execution_time for t in timed)), 5)
 
 
+@dataclass
+class TimingStats:
+    """Summary statistics (in ms) of the repeated timings of a single phase."""
+
+    samples: List[float]
+    min: float
+    median: float
+    mean: float
+    p95: float
+    stddev: float
+
+    @staticmethod
+    def from_ns(samples_ns: List[int]) -> "TimingStats":
+        """Calculates the summary statistics of a list of timings.
+
+        :param samples_ns: the timings in nanoseconds
+        :return: the summary statistics in milliseconds
+        """
+        samples = sorted(ns / 1_000_000 for ns in samples_ns)
+        return TimingStats(
+            samples=samples,
+            min=round(samples[0], 5),
+            median=round(statistics.median(samples), 5),
+            mean=round(statistics.fmean(samples), 5),
+            p95=round(samples[max(math.ceil(0.95 * len(samples)) - 1, 0)], 5),
+            stddev=round(statistics.stdev(samples), 5) if len(samples) > 1 else 0.0,
+        )
+
+
+class Point(NamedTuple):
+    """An immutable 2D integer point that doubles as a vector. Being a tuple it has no per-instance dict, and hashing
+    and equality are done natively.
+    """
+
+    x: int
+    y: int
+
+    KEY_OFFSET = 1 << 31
+    """Offset that maps signed 32 bit coordinates to unsigned ones when packing a key."""
+
+    def __add__(self, other: Tuple[int, int]) -> "Point":
+        return Point(self.x + other[0], self.y + other[1])
+
+    def __sub__(self, other: Tuple[int, int]) -> "Point":
+        return Point(self.x - other[0], self.y - other[1])
+
+    def __mul__(self, factor: int) -> "Point":
+        return Point(self.x * factor, self.y * factor)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> "Point":
+        return Point(-self.x, -self.y)
+
+    def calculate_distance(self, other: "Point") -> "Point":
+        """Calculates the vector from another point to this point.
+
+        :param other: the other point
+        :return: the (x, y) distance
+        """
+        return Point(self.x - other.x, self.y - other.y)
+
+    def to_key(self) -> int:
+        """Packs the point into a single non-negative integer, which is cheaper to hash and store than the point.
+
+        :return: the packed key
+        """
+        return ((self.y + Point.KEY_OFFSET) << 32) | (self.x + Point.KEY_OFFSET)
+
+    @staticmethod
+    def from_key(key: int) -> "Point":
+        """Unpacks a point from its key.
+
+        :param key: the packed key
+        :return: the point
+        """
+        return Point((key & 0xFFFFFFFF) - Point.KEY_OFFSET, (key >> 32) - Point.KEY_OFFSET)
+
+
+class PointArray:
+    """A batch of points stored as parallel `array("i")` columns of x and y coordinates. Transforms operate on whole
+    columns at once and never allocate a Point per element.
+    """
+
+    __slots__ = ("xs", "ys")
+
+    def __init__(self, xs: Optional[array] = None, ys: Optional[array] = None):
+        self.xs = array("i") if xs is None else xs
+        self.ys = array("i") if ys is None else ys
+        if len(self.xs) != len(self.ys):
+            raise ValueError(f"Invalid PointArray columns: {len(self.xs)} != {len(self.ys)}")
+
+    @staticmethod
+    def from_points(points: Iterable[Tuple[int, int]]) -> "PointArray":
+        """Constructs a batch from points.
+
+        :param points: the points
+        :return: the batch of points
+        """
+        batch = PointArray()
+        for x, y in points:
+            batch.xs.append(x)
+            batch.ys.append(y)
+
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __iter__(self) -> Iterator[Point]:
+        return map(Point, self.xs, self.ys)
+
+    def __getitem__(self, index: int) -> Point:
+        return Point(self.xs[index], self.ys[index])
+
+    def append(self, point: Tuple[int, int]):
+        """Adds a point to the batch.
+
+        :param point: the point
+        """
+        self.xs.append(point[0])
+        self.ys.append(point[1])
+
+    def translate(self, dx: int, dy: int) -> "PointArray":
+        """Moves every point of the batch by the same vector.
+
+        :param dx: the x distance
+        :param dy: the y distance
+        :return: the moved batch
+        """
+        return PointArray(
+            array("i", map(operator.add, self.xs, repeat(dx))), array("i", map(operator.add, self.ys, repeat(dy)))
+        )
+
+    def scale(self, factor: int) -> "PointArray":
+        """Multiplies every point of the batch by the same factor.
+
+        :param factor: the factor
+        :return: the scaled batch
+        """
+        return PointArray(
+            array("i", map(operator.mul, self.xs, repeat(factor))),
+            array("i", map(operator.mul, self.ys, repeat(factor))),
+        )
+
+    def in_bounds(self, width: int, height: int) -> "PointArray":
+        """Filters the batch down to the points on a `width` x `height` grid.
+
+        :param width: the width of the grid
+        :param height: the height of the grid
+        :return: the filtered batch
+        """
+        batch = PointArray()
+        for x, y in zip(self.xs, self.ys):
+            if 0 <= x < width and 0 <= y < height:
+                batch.xs.append(x)
+                batch.ys.append(y)
+
+        return batch
+
+    def to_keys(self) -> array:
+        """Packs every point of the batch into its key.
+
+        :return: the packed keys
+        """
+        offset = Point.KEY_OFFSET
+        return array("Q", (((y + offset) << 32) | (x + offset) for x, y in zip(self.xs, self.ys)))
+
+
+class Grid:
+    """A rectangular grid of single byte cells stored row by row in one flat bytearray. Cells are addressed either by
+    (x, y) coordinates, with (0, 0) the top left cell, or by their flat index `y * width + x`. Rows, columns and
+    diagonals are returned as memoryviews of the underlying buffer, so they are not copied.
+    """
+
+    __slots__ = ("data", "width", "height")
+
+    def __init__(self, data: bytearray, width: int):
+        if width <= 0 or len(data) % width != 0:
+            raise ValueError(f"Invalid Grid width: {width}")
+
+        self.data = data
+        self.width = width
+        self.height = len(data) // width
+
+    @staticmethod
+    def from_lines(lines: Iterable[str]) -> "Grid":
+        """Constructs a grid from lines of equal length. Empty lines are ignored.
+
+        :param lines: the rows of the grid
+        :return: the grid
+        """
+        data = bytearray()
+        width = None
+        for line in lines:
+            if not line:
+                continue
+
+            if width is None:
+                width = len(line)
+            elif len(line) != width:
+                raise ValueError(f"Invalid Grid row length: {len(line)} != {width}")
+
+            data += line.encode()
+
+        return Grid(data, width or 0)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """Determines whether the coordinates are on the grid.
+
+        :param x: the column
+        :param y: the row
+        :return: True if the coordinates are on the grid, False otherwise
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def index(self, x: int, y: int) -> int:
+        """Converts coordinates to a flat index.
+
+        :param x: the column
+        :param y: the row
+        :return: the flat index
+        """
+        return y * self.width + x
+
+    def coords(self, index: int) -> Tuple[int, int]:
+        """Converts a flat index to coordinates.
+
+        :param index: the flat index
+        :return: the (x, y) coordinates
+        """
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def get(self, x: int, y: int, default: Optional[int] = None) -> Optional[int]:
+        """Returns the cell at the coordinates or the default if the coordinates are not on the grid.
+
+        :param x: the column
+        :param y: the row
+        :param default: the value to return for coordinates that are not on the grid
+        :return: the byte value of the cell
+        """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.data[y * self.width + x]
+
+        return default
+
+    def row(self, y: int) -> memoryview:
+        """Returns a view of a row from left to right.
+
+        :param y: the row
+        :return: the view of the row
+        """
+        return memoryview(self.data)[y * self.width : (y + 1) * self.width]
+
+    def column(self, x: int) -> memoryview:
+        """Returns a view of a column from top to bottom.
+
+        :param x: the column
+        :return: the view of the column
+        """
+        return memoryview(self.data)[x :: self.width]
+
+    def diagonal(self, x: int, y: int) -> memoryview:
+        """Returns a view of the diagonal that starts at the coordinates and goes down and to the right.
+
+        :param x: the starting column
+        :param y: the starting row
+        :return: the view of the diagonal
+        """
+        length = min(self.width - x, self.height - y)
+        start = y * self.width + x
+        return memoryview(self.data)[start : start + (length - 1) * (self.width + 1) + 1 : self.width + 1]
+
+    def anti_diagonal(self, x: int, y: int) -> memoryview:
+        """Returns a view of the diagonal that starts at the coordinates and goes down and to the left.
+
+        :param x: the starting column
+        :param y: the starting row
+        :return: the view of the diagonal
+        """
+        length = min(x + 1, self.height - y)
+        start = y * self.width + x
+        step = self.width - 1
+        if step == 0:
+            return memoryview(self.data)[start : start + length]
+
+        return memoryview(self.data)[start : start + (length - 1) * step + 1 : step]
+
+    def diagonals(self) -> Iterator[memoryview]:
+        """Returns views of all the diagonals that go down and to the right, starting from the bottom left corner.
+
+        :return: the views of the diagonals
+        """
+        for y in range(self.height - 1, 0, -1):
+            yield self.diagonal(0, y)
+        for x in range(self.width):
+            yield self.diagonal(x, 0)
+
+    def anti_diagonals(self) -> Iterator[memoryview]:
+        """Returns views of all the diagonals that go down and to the left, starting from the top left corner.
+
+        :return: the views of the diagonals
+        """
+        for x in range(self.width):
+            yield self.anti_diagonal(x, 0)
+        for y in range(1, self.height):
+            yield self.anti_diagonal(self.width - 1, y)
+
+    def find_all(self, value: int | bytes) -> Iterator[int]:
+        """Finds the flat indexes of all the cells that are equal to the value.
+
+        :param value: the byte value (or single byte string) to search for
+        :return: the flat indexes of the matching cells in increasing order
+        """
+        index = self.data.find(value)
+        while index != -1:
+            yield index
+            index = self.data.find(value, index + 1)
+
+
+class InputMode(Enum):
+    """Represents how the input file of a problem is loaded."""
+
+    LINES = 1
+    """The whole input is read into `self.lines` during setup."""
+
+    STREAM = 2
+    """Nothing is read during setup, the problem reads its input with `iter_input_lines` or `iter_input_chunks`."""
+
+
 class Problem:
+    input_mode = InputMode.LINES
+    input_path: Optional[str] = None
+    scaling_sizes: Tuple[int, ...] = ()
+    engines: Tuple[str, ...] = ("python",)
+    engine = "python"
+    workers = 1
+
     def __init__(self):
-        self.lines = self.read_input_file()
+        if self.input_mode == InputMode.LINES:
+            self.lines = self.read_input_file()
 
     def part_one(self) -> int | str:
         raise NotImplementedError()
@@ -34,42 +429,1123 @@ class Problem:
     def part_two(self) -> int | str:
         raise NotImplementedError()
 
-    @staticmethod
-    def read_input_file() -> List[str]:
-        """Reads the txt file with the same name as the basename of the script in an "input" directory in the same
-        directory as the execution script.
+    @classmethod
+    def generate_input(cls, size: int, rng: random.Random) -> Iterator[str]:
+        """Generates a valid input for the problem. The meaning of the size is defined by every problem and is the
+        dimension that its solvers scale with, e.g. the number of lines or the width of a grid.
+
+        :param size: the size of the input
+        :param rng: the seeded random number generator
+        :return: the lines of the input
+        """
+        raise NotImplementedError()
+
+    @classmethod
+    @contextmanager
+    def use_input_file(cls, path: str) -> Generator[None, None, None]:
+        """Temporarily replaces the input file of the problem.
+
+        :param path: the path of the replacement input file
+        """
+        previous = cls.__dict__.get("input_path")
+        cls.input_path = os.path.abspath(path)
+        try:
+            yield
+        finally:
+            if previous is None:
+                del cls.input_path
+            else:
+                cls.input_path = previous
+
+    @classmethod
+    def input_file_path(cls) -> str:
+        """Finds the txt file with the same name as the basename of the module that defines the problem in an "input"
+        directory in the same directory as the module, unless an input file has been set explicitly.
+
+        :return: the path of the input file
+        """
+        if cls.input_path is not None:
+            return cls.input_path
+
+        module_path = os.path.abspath(sys.modules[cls.__module__].__file__)
+        return os.path.join(
+            os.path.dirname(module_path), "input", os.path.splitext(os.path.basename(module_path))[0] + ".txt"
+        )
+
+    @classmethod
+    def input_hash(cls) -> str:
+        """Calculates the sha256 hash of the input file of the problem.
+
+        :return: the hex digest of the input file
+        """
+        with open(cls.input_file_path(), "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    @classmethod
+    def read_input_file(cls) -> List[str]:
+        """Reads the input file of the problem.
 
         :return: the contained lines in the input file
         """
-        script_split = sys.argv[0].split(os.path.sep)
-        with open(os.path.sep + os.path.join(*script_split[:-1], "input", script_split[-1].replace("py", "txt"))) as f:
+        with open(cls.input_file_path()) as f:
             return [line.strip() for line in f.readlines()]
 
+    @classmethod
+    def iter_input_lines(cls) -> Generator[str, None, None]:
+        """Lazily reads the input file of the problem one line at a time, so that problems do not keep a copy of the
+        raw lines.
+
+        :return: a generator of the stripped lines in the input file
+        """
+        with open(cls.input_file_path()) as f:
+            for line in f:
+                yield line.strip()
+
+    @classmethod
+    def iter_input_chunks(cls, chunk_size: int = 1 << 20) -> Generator[bytes, None, None]:
+        """Lazily reads the raw bytes of the input file of the problem in fixed-size chunks. Lines, and anything else,
+        may be split across chunks.
+
+        :param chunk_size: the maximum number of bytes per chunk
+        :return: a generator of the chunks of the input file
+        """
+        with open(cls.input_file_path(), "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def map_forked(self, function: Callable[..., Any], chunks: List[Tuple]) -> List[Any]:
+        """Calls a function of the problem on every chunk of arguments across a pool of `workers` processes. The
+        processes are forked so they inherit the parsed problem, and only the chunks and the results are pickled. With
+        a single worker or chunk the function is called in this process.
+
+        :param function: the function to call with the problem and the arguments of a chunk, e.g. an unbound method
+        :param chunks: the arguments of every chunk
+        :return: the results of every chunk, in the order of the chunks
+        """
+        if self.workers == 1 or len(chunks) <= 1:
+            return [function(self, *chunk) for chunk in chunks]
+
+        global _forked_problem
+        _forked_problem = self
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                min(self.workers, len(chunks)), mp_context=multiprocessing.get_context("fork")
+            ) as pool:
+                return list(pool.map(_call_forked, repeat(function), chunks))
+        finally:
+            _forked_problem = None
+
+
+_forked_problem: Optional[Problem] = None
+
+
+def _call_forked(function: Callable[..., Any], chunk: Tuple) -> Any:
+    """Calls a function with a chunk of arguments in a worker process that inherited the problem from its parent.
+
+    :param function: the function to call with the problem and the arguments of the chunk
+    :param chunk: the arguments of the chunk
+    :return: the result of the function
+    """
+    return function(_forked_problem, *chunk)
+
+
+class BenchmarkHistory:
+    """File-backed store of recorded phase timings that detects regressions against the recorded baselines. Every
+    record is a json line containing the git commit, the input hash, the python version and the measurement mode of the
+    run. Timings are only compared against baselines measured in the same mode, as a benchmark median, a single sample
+    and a suite sample are not comparable.
+    """
+
+    DEFAULT_PATH = os.path.join(ROOT_DIR, ".benchmark_history.jsonl")
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+
+    @staticmethod
+    def add_arguments(parser: argparse.ArgumentParser):
+        """Adds the history options to a command line parser.
+
+        :param parser: the parser to extend
+        """
+        parser.add_argument("--record", action="store_true", help="store the timings in the benchmark history")
+        parser.add_argument(
+            "--compare", action="store_true", help="exit non-zero if a phase is slower than its recorded baseline"
+        )
+        parser.add_argument(
+            "--threshold", type=float, default=0.1, help="allowed slowdown ratio before a phase is a regression"
+        )
+        parser.add_argument(
+            "--min-delta", type=float, default=0.5, help="allowed absolute slowdown (ms) before a phase is a regression"
+        )
+        parser.add_argument(
+            "--history", default=BenchmarkHistory.DEFAULT_PATH, help="path of the benchmark history file"
+        )
+
+    @staticmethod
+    def git_commit() -> Optional[str]:
+        """Finds the git commit of the working tree, suffixed with -dirty if it has uncommitted changes.
+
+        :return: the commit or None if it can not be determined
+        """
+        try:
+            return subprocess.run(
+                ["git", "describe", "--always", "--dirty", "--abbrev=40"],
+                cwd=ROOT_DIR,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def records(self) -> List[Dict]:
+        """Reads all the recorded timings.
+
+        :return: the records in the order they were recorded
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        with open(self.path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @staticmethod
+    def mode(args: argparse.Namespace, suite: bool = False) -> str:
+        """Describes how the timings of a run were measured.
+
+        :param args: the parsed options of the run
+        :param suite: whether the timings come from a suite run
+        :return: the measurement mode, e.g. benchmark-20, single, parallel-parts or suite, suffixed with +cache if the
+            parsed inputs may come from the cache
+        """
+        if suite:
+            mode = "suite"
+        elif args.benchmark:
+            mode = f"benchmark-{args.repeats}"
+        elif args.parallel_parts:
+            mode = "parallel-parts"
+        else:
+            mode = "single"
+
+        return f"{mode}+cache" if args.cache else mode
+
+    def record(self, name: str, input_hash: str, timings: Dict[str, float], mode: str, commit: Optional[str] = None):
+        """Appends the timings of a problem to the history.
+
+        :param name: the name of the problem
+        :param input_hash: the hash of the input file
+        :param timings: the timing (ms) of every phase
+        :param mode: the measurement mode of the timings
+        :param commit: the git commit of the run
+        """
+        with open(self.path, "a") as f:
+            f.write(
+                json.dumps(
+                    {
+                        "name": name,
+                        "timestamp": time.time(),
+                        "commit": commit,
+                        "input_hash": input_hash,
+                        "python_version": platform.python_version(),
+                        "mode": mode,
+                        "timings": timings,
+                    }
+                )
+                + "\n"
+            )
+
+    def baseline(self, name: str, input_hash: str, mode: str) -> Optional[Dict]:
+        """Finds the most recent record of a problem with the same input, python version and measurement mode.
+
+        :param name: the name of the problem
+        :param input_hash: the hash of the input file
+        :param mode: the measurement mode of the timings
+        :return: the baseline record or None if there is none
+        """
+        python_version = platform.python_version()
+        return next(
+            (
+                r
+                for r in self.records()[::-1]
+                if r["name"] == name
+                and r["input_hash"] == input_hash
+                and r["python_version"] == python_version
+                and r.get("mode") == mode
+            ),
+            None,
+        )
+
+    @staticmethod
+    def regressions(
+        timings: Dict[str, float], baseline: Dict, threshold: float, min_delta: float
+    ) -> List[Tuple[str, float, float]]:
+        """Finds all the phases that got slower than their baseline by more than the threshold.
+
+        :param timings: the timing (ms) of every phase
+        :param baseline: the baseline record
+        :param threshold: the allowed slowdown ratio
+        :param min_delta: the allowed absolute slowdown (ms) that hides the noise of very short phases
+        :return: a list of (phase, baseline timing, timing) tuples
+        """
+        return [
+            (phase, baseline["timings"][phase], timing)
+            for phase, timing in timings.items()
+            if phase in baseline["timings"]
+            and timing > baseline["timings"][phase] * (1 + threshold)
+            and timing - baseline["timings"][phase] > min_delta
+        ]
+
+    def check(self, args: argparse.Namespace, results: List[Tuple[str, str, Dict[str, float]]], mode: str) -> bool:
+        """Compares and/or records the timings of the problems as requested by the history options.
+
+        :param args: the parsed history options
+        :param results: a list of (problem name, input hash, timing (ms) of every phase) tuples
+        :param mode: the measurement mode of the timings
+        :return: True if any phase regressed, False otherwise
+        """
+        regressed = False
+        if args.compare:
+            print(f"\n-----------\nRegressions\n-----------\nMode: {mode}")
+            for name, input_hash, timings in results:
+                baseline = self.baseline(name, input_hash, mode)
+                if baseline is None:
+                    print(f"{name}: no baseline recorded in {mode} mode")
+                    continue
+
+                for phase, baseline_timing, timing in self.regressions(
+                    timings, baseline, args.threshold, args.min_delta
+                ):
+                    regressed = True
+                    print(
+                        f"{name} {phase}: {baseline_timing} -> {timing} "
+                        f"(+{round((timing / baseline_timing - 1) * 100, 1)}%, baseline {baseline['commit']})"
+                    )
+
+            if not regressed:
+                print("None")
+
+        if args.record:
+            commit = self.git_commit()
+            for name, input_hash, timings in results:
+                self.record(name, input_hash, timings, mode, commit)
+
+        return regressed
+
+
+class PhaseProfiler:
+    """Profiles every phase of a problem separately with cProfile. The stats of every phase are saved in a run
+    directory as a pstats file and as collapsed stacks that can be rendered by flamegraph tools.
+    """
+
+    def __init__(self, run_dir: str):
+        self.run_dir = run_dir
+        self.stats = {}
+
+    @contextmanager
+    def profile(self, phase: str) -> Generator["PhaseProfiler", None, None]:
+        """Profiles the execution of a phase and saves its stats.
+
+        :param phase: the name of the phase
+        """
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield self
+        finally:
+            profiler.disable()
+            os.makedirs(self.run_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.run_dir, f"{phase}.pstats"))
+            self.stats[phase] = pstats.Stats(profiler)
+            with open(os.path.join(self.run_dir, f"{phase}.collapsed"), "w") as f:
+                for stack, microseconds in self.collapsed_stacks(self.stats[phase]).items():
+                    f.write(f"{stack} {microseconds}\n")
+
+    @staticmethod
+    def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+        """Reconstructs the call stacks from the caller/callee edges of the stats. cProfile only records a single level
+        of callers, so the time of a function is split across its call paths in proportion to the cumulative time of
+        every edge. Recursive calls are folded into the first occurrence of the function on the stack.
+
+        :param stats: the profiler stats
+        :return: a mapping of semicolon separated stacks to their self time in microseconds
+        """
+
+        def label(func: Tuple[str, int, str]) -> str:
+            file_name, line, func_name = func
+            name = func_name if file_name == "~" else f"{func_name} ({os.path.basename(file_name)}:{line})"
+            return name.replace(";", ",")
+
+        children = {}
+        for func, (_, _, _, _, callers) in stats.stats.items():
+            for caller, (_, _, _, edge_ct) in callers.items():
+                children.setdefault(caller, []).append((func, edge_ct))
+
+        collapsed = {}
+
+        def visit(func: Tuple[str, int, str], stack: List[Tuple[str, int, str]], budget: float):
+            _, _, tt, ct, _ = stats.stats[func]
+            if ct <= 0 or budget <= 0:
+                return
+
+            ratio = min(budget / ct, 1.0)
+            key = ";".join(label(f) for f in stack)
+            collapsed[key] = collapsed.get(key, 0) + tt * ratio * 1_000_000
+            for child, edge_ct in children.get(func, []):
+                if child not in stack:
+                    visit(child, [*stack, child], edge_ct * ratio)
+
+        for func, (_, _, _, ct, callers) in stats.stats.items():
+            if not any(caller in stats.stats for caller in callers):
+                visit(func, [func], ct)
+
+        return {stack: round(microseconds) for stack, microseconds in collapsed.items() if round(microseconds) > 0}
+
+    def print_top(self, n: int):
+        """Prints the top functions of every profiled phase sorted by cumulative time.
+
+        :param n: the number of functions to print per phase
+        """
+        for phase, stats in self.stats.items():
+            print(f"\n{''.join(['-' for i in range(len(phase) + 9)])}\nProfile: {phase}")
+            print("".join(["-" for i in range(len(phase) + 9)]))
+            stats.stream = sys.stdout
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(n)
+
+        print(f"Profiles saved in: {self.run_dir}")
+
+
+@dataclass
+class MemoryUsage:
+    """Memory usage (in bytes) of a single phase."""
+
+    peak: int
+    retained: int
+    rss_delta: int
+
+
+class MemoryTracker:
+    """Tracks the peak traced allocation, the net retained memory and the RSS delta of every phase. Tracing only
+    happens while a phase is tracked, so an unused tracker adds no overhead.
+    """
+
+    def __init__(self):
+        self.usage = {}
+
+    @staticmethod
+    def rss() -> int:
+        """Finds the resident set size of the current process. Falls back to the max resident set size on platforms
+        without procfs.
+
+        :return: the resident set size in bytes
+        """
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            import resource
+
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    @contextmanager
+    def track(self, phase: str) -> Generator["MemoryTracker", None, None]:
+        """Tracks the memory usage of a phase.
+
+        :param phase: the name of the phase
+        """
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+
+        tracemalloc.reset_peak()
+        traced_before, _ = tracemalloc.get_traced_memory()
+        rss_before = self.rss()
+        try:
+            yield self
+        finally:
+            traced_after, traced_peak = tracemalloc.get_traced_memory()
+            self.usage[phase] = MemoryUsage(
+                peak=traced_peak - traced_before,
+                retained=traced_after - traced_before,
+                rss_delta=self.rss() - rss_before,
+            )
+            if not tracing:
+                tracemalloc.stop()
+
+    def print_usage(self):
+        """Prints the memory usage of every tracked phase."""
+        print("\n------------\nMemory (KiB)\n------------")
+        for phase, usage in self.usage.items():
+            print(
+                f"{phase}: peak: {round(usage.peak / 1024, 1)} | retained: {round(usage.retained / 1024, 1)} | "
+                f"rss delta: {round(usage.rss_delta / 1024, 1)}"
+            )
+
+
+class ParsedInputCache:
+    """Content-addressed cache of the parsed state of problems. The state of a problem (its instance attributes after
+    setup) is pickled and keyed on the hash of its input file and the source of the module that defines it, so any
+    change to the input or the parser invalidates the entry. The least recently used entries are evicted once the
+    cache exceeds its size limit.
+    """
+
+    DEFAULT_DIR = os.path.join(ROOT_DIR, ".cache", "parsed_inputs")
+
+    def __init__(self, cache_dir: str = DEFAULT_DIR, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(problem_type: Type[Problem]) -> str:
+        """Calculates the cache key of a problem.
+
+        :param problem_type: the problem
+        :return: the hex digest of the input file, the module source, the utils source (the parsed state may hold its
+            classes), the module name, the engine and the python version
+        """
+        digest = hashlib.sha256()
+        for path in (problem_type.input_file_path(), sys.modules[problem_type.__module__].__file__, __file__):
+            with open(path, "rb") as f:
+                hashlib.file_digest(f, lambda: digest)
+
+        digest.update(problem_type.__module__.encode())
+        digest.update(problem_type.engine.encode())
+        digest.update(platform.python_version().encode())
+        return digest.hexdigest()
+
+    def path(self, problem_type: Type[Problem]) -> str:
+        """Finds the path of the cache entry of a problem.
+
+        :param problem_type: the problem
+        :return: the path of the cache entry
+        """
+        return os.path.join(self.cache_dir, f"{problem_type.__name__}-{self.key(problem_type)}.pickle")
+
+    def load(self, problem_type: Type[Problem]) -> Optional[Problem]:
+        """Restores a problem from its cache entry. Entries that can not be unpickled are removed.
+
+        :param problem_type: the problem
+        :return: the restored problem or None if there is no usable cache entry
+        """
+        path = self.path(problem_type)
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            os.remove(path)
+            return None
+
+        os.utime(path)
+        problem = problem_type.__new__(problem_type)
+        problem.__dict__.update(state)
+        return problem
+
+    def store(self, problem: Problem):
+        """Stores the state of a problem and evicts the least recently used entries that exceed the size limit.
+
+        :param problem: the problem to store
+        """
+        data = pickle.dumps(vars(problem), protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(type(problem))
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits in its size limit."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pickle"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+
+            os.remove(path)
+            total_bytes -= size
+
+    def construct(self, problem_type: Type[Problem]) -> Problem:
+        """Restores a problem from the cache or constructs and caches it.
+
+        :param problem_type: the problem
+        :return: the problem
+        """
+        problem = self.load(problem_type)
+        if problem is None:
+            problem = problem_type()
+            self.store(problem)
+
+        return problem
+
+
+class MemoryParsedInputCache(ParsedInputCache):
+    """Parsed input cache that keeps its pickled entries in memory, for long-lived runners. The entries are still
+    pickled so that every run gets its own copy of the parsed state. They are keyed on the parser of the problem rather
+    than on its whole module, so that editing a part of a problem keeps its parsed input warm. The parser digest of a
+    problem is calculated once per loaded module by `prepare`, so a lookup only stats and, if it changed, hashes the
+    input file.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__(cache_dir="", max_bytes=max_bytes)
+        self.entries = {}
+        self.parser_digests = {}
+        self.input_digests = {}
+        with open(__file__, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256")
+        digest.update(platform.python_version().encode())
+        self.utils_digest = digest.hexdigest()
+
+    @staticmethod
+    def parser_source(problem_type: Type[Problem]) -> str:
+        """Extracts the source of the parser of a problem: its module without the methods of the problem that are not
+        reachable from `__init__`.
+
+        :param problem_type: the problem
+        :return: the normalized source of the parser
+        """
+        with open(sys.modules[problem_type.__module__].__file__) as f:
+            module = ast.parse(f.read())
+
+        for node in module.body:
+            if isinstance(node, ast.ClassDef) and node.name == problem_type.__name__:
+                methods = {n.name: n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))}
+                reachable = set()
+                pending = ["__init__"]
+                while pending:
+                    name = pending.pop()
+                    if name in methods and name not in reachable:
+                        reachable.add(name)
+                        pending.extend(n.attr for n in ast.walk(methods[name]) if isinstance(n, ast.Attribute))
+
+                node.body = [n for n in node.body if n not in methods.values() or n.name in reachable]
+
+        return ast.unparse(module)
+
+    def prepare(self, problem_type: Type[Problem]):
+        """Calculates the parser digest of a freshly loaded problem. It is called once per load of the module of the
+        problem, before any run, so that lookups do not pay for parsing the module source.
+
+        :param problem_type: the problem
+        """
+        digest = hashlib.sha256(self.utils_digest.encode())
+        digest.update(problem_type.__module__.encode())
+        digest.update(self.parser_source(problem_type).encode())
+        self.parser_digests[(problem_type.__module__, problem_type.__name__)] = digest.hexdigest()
+
+    def input_digest(self, path: str) -> str:
+        """Hashes an input file, reusing the previous digest while its modification time and size are unchanged.
+
+        :param path: the path of the input file
+        :return: the hex digest of the input file
+        """
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self.input_digests.get(path)
+        if cached is None or cached[0] != version:
+            with open(path, "rb") as f:
+                cached = (version, hashlib.file_digest(f, "sha256").hexdigest())
+            self.input_digests[path] = cached
+
+        return cached[1]
+
+    def path(self, problem_type: Type[Problem]) -> str:
+        """Calculates the key of the in-memory entry of a problem. The engine and the input are read at lookup time as
+        the runner sets them after the module is loaded.
+
+        :param problem_type: the problem
+        :return: the key of the entry
+        """
+        parser_digest = self.parser_digests.get((problem_type.__module__, problem_type.__name__))
+        if parser_digest is None:
+            self.prepare(problem_type)
+            parser_digest = self.parser_digests[(problem_type.__module__, problem_type.__name__)]
+
+        return f"{parser_digest}-{problem_type.engine}-{self.input_digest(problem_type.input_file_path())}"
+
+    def load(self, problem_type: Type[Problem]) -> Optional[Problem]:
+        """Restores a problem from its in-memory entry.
+
+        :param problem_type: the problem
+        :return: the restored problem or None if there is no entry
+        """
+        key = self.path(problem_type)
+        if key not in self.entries:
+            return None
+
+        self.entries[key] = self.entries.pop(key)
+        problem = problem_type.__new__(problem_type)
+        problem.__dict__.update(pickle.loads(self.entries[key]))
+        return problem
+
+    def store(self, problem: Problem):
+        """Stores the state of a problem in memory and evicts the least recently used entries that exceed the size
+        limit.
+
+        :param problem: the problem to store
+        """
+        data = pickle.dumps(vars(problem), protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+
+        self.entries[self.path(type(problem))] = data
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits in its size limit."""
+        total_bytes = sum(len(data) for data in self.entries.values())
+        while total_bytes > self.max_bytes:
+            total_bytes -= len(self.entries.pop(next(iter(self.entries))))
+
 
 class ProblemRunner:
     """Runner class for problems that handles calculating timings for all pieces of the problem solution."""
 
-    def __init__(self, problem_type: Type[Problem]):
+    PHASES = ("setup", "part_one", "part_two")
+
+    def __init__(
+        self,
+        problem_type: Type[Problem],
+        cache: Optional[ParsedInputCache] = None,
+        startup_time: Optional[float] = None,
+    ):
         self.problem_type = problem_type
+        self.cache = cache
+        self.startup_time = startup_time
+
+    @staticmethod
+    def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+        """Parses the runner options from the command line.
+
+        :param argv: the arguments to parse, defaults to the arguments of the current process
+        :return: the parsed options
+        """
+        parser = argparse.ArgumentParser(description="Runs an advent of code problem and reports its timings.")
+        parser.add_argument(
+            "-b", "--benchmark", action="store_true", help="time every phase repeatedly and report statistics"
+        )
+        parser.add_argument("--repeats", type=int, default=20, help="number of timed runs in benchmark mode")
+        parser.add_argument("--warmup", type=int, default=3, help="number of untimed runs in benchmark mode")
+        parser.add_argument(
+            "--profile",
+            nargs="?",
+            const=os.path.join(ROOT_DIR, "profiles"),
+            default=None,
+            metavar="DIR",
+            help="profile every phase and save the stats in a run directory under DIR",
+        )
+        parser.add_argument("--top", type=int, default=15, help="number of functions to print per profiled phase")
+        parser.add_argument(
+            "--memory", action="store_true", help="report the peak, retained and RSS memory of every phase"
+        )
+        parser.add_argument(
+            "--cache", action="store_true", help="restore the parsed input from the cache instead of parsing it"
+        )
+        parser.add_argument("--input", default=None, help="run with this input file instead of the puzzle input")
+        parser.add_argument("--engine", default=None, help="the solver engine to use if the problem has several")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="the number of processes for problems that parallelize their parts",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="the size of the chunks for problems that split their input into chunks (a `chunk_size` attribute)",
+        )
+        parser.add_argument(
+            "--generate", type=int, default=None, metavar="SIZE", help="write a synthetic input of SIZE to stdout"
+        )
+        parser.add_argument(
+            "--scaling",
+            nargs="?",
+            const="",
+            default=None,
+            metavar="SIZES",
+            help="benchmark synthetic inputs of the comma separated SIZES (defaults to the sizes of the problem) and "
+            "report the empirical growth exponent of every phase",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic input generator")
+        parser.add_argument(
+            "--parallel-parts",
+            action="store_true",
+            help="fork a process per part after the setup so both parts run concurrently on the parsed problem",
+        )
+        BenchmarkHistory.add_arguments(parser)
+        args = parser.parse_args(argv)
+        if (args.profile is not None or args.memory) and (args.benchmark or args.record or args.compare):
+            parser.error("--profile and --memory slow down the phases and can not be combined with timing options")
+        if args.parallel_parts and (
+            args.benchmark or args.scaling is not None or args.profile is not None or args.memory
+        ):
+            parser.error("--parallel-parts can only be combined with a single run")
+        if args.parallel_parts and not hasattr(os, "fork"):
+            parser.error("--parallel-parts requires a platform that supports fork")
+
+        return args
+
+    def run(self, argv: Optional[List[str]] = None):
+        """Runs the problem with the options found on the command line and prints the report.
+
+        :param argv: the arguments to parse, defaults to the arguments of the current process
+        """
+        startup_time = self.startup_time if self.startup_time is not None else self.process_uptime()
+        args = self.parse_args(argv)
+        if args.cache:
+            self.cache = ParsedInputCache()
+        elif args.benchmark or args.scaling is not None or args.record or args.compare:
+            # a restored state would be timed as the setup, only an explicit --cache may do that
+            self.cache = None
+
+        if args.input is not None:
+            self.problem_type.input_path = os.path.abspath(args.input)
+
+        if args.engine is not None:
+            if args.engine not in self.problem_type.engines:
+                raise ValueError(
+                    f"Invalid engine: {args.engine}, expected one of: {', '.join(self.problem_type.engines)}"
+                )
+
+            self.problem_type.engine = args.engine
+
+        if self.problem_type.engine == "numpy":
+            # import numpy before the timed phases, so that they measure the engine rather than the import, which is
+            # reported as part of the startup instead
+            with Timed().start() as numpy_import:
+                import_numpy()
+
+            if startup_time is not None:
+                startup_time = round(startup_time + numpy_import.execution_time, 5)
+
+        if args.workers is not None:
+            if args.workers < 1:
+                raise ValueError(f"Invalid number of workers: {args.workers}, expected at least 1")
+
+            self.problem_type.workers = args.workers
 
-    def run(self):
-        with Timed().start() as setup_time:
-            problem = self.problem_type()
+        if args.chunk_size is not None:
+            if not hasattr(self.problem_type, "chunk_size"):
+                raise ValueError(f"{self.problem_type.__name__} does not split its input into chunks")
+            if args.chunk_size < 1:
+                raise ValueError(f"Invalid chunk size: {args.chunk_size}, expected at least 1")
 
-        with Timed().start() as part1_time:
+            self.problem_type.chunk_size = args.chunk_size
+
+        if args.generate is not None:
+            for line in self.problem_type.generate_input(args.generate, random.Random(args.seed)):
+                sys.stdout.write(line + "\n")
+            return
+
+        if args.scaling is not None:
+            sizes = [int(size) for size in args.scaling.split(",")] if args.scaling else self.problem_type.scaling_sizes
+            self.print_scaling(self.scaling(sizes, args.repeats, args.warmup, args.seed))
+            return
+
+        if args.benchmark:
+            answers, stats = self.benchmark(args.repeats, args.warmup)
+            self.print_benchmark(answers, stats, args.warmup, startup_time)
+            phase_timings = {phase: s.median for phase, s in stats.items()}
+        elif args.parallel_parts:
+            answers, timings, parts_wall = self.run_parallel_parts()
+            self.print_run(answers, timings, parts_wall, startup_time)
+            phase_timings = {phase: timed.execution_time for phase, timed in timings.items()}
+        else:
+            profiler = None
+            if args.profile is not None:
+                profiler = PhaseProfiler(
+                    os.path.join(args.profile, self.problem_type.__name__, time.strftime("%Y%m%d-%H%M%S"))
+                )
+
+            memory_tracker = MemoryTracker() if args.memory else None
+            answers, timings = self.run_once(profiler, memory_tracker)
+            self.print_run(answers, timings, startup_time=startup_time)
+            if memory_tracker is not None:
+                memory_tracker.print_usage()
+            if profiler is not None:
+                profiler.print_top(args.top)
+
+            phase_timings = {phase: timed.execution_time for phase, timed in timings.items()}
+
+        if (args.record or args.compare) and BenchmarkHistory(args.history).check(
+            args,
+            [(self.problem_type.__name__, self.problem_type.input_hash(), phase_timings)],
+            BenchmarkHistory.mode(args),
+        ):
+            sys.exit(1)
+
+    @staticmethod
+    def process_uptime() -> Optional[float]:
+        """Finds how long the current process has been running. At the start of a run this is the startup time of the
+        interpreter and of the imports. The kernel reports it in clock ticks, so it has a resolution of about 10 ms.
+
+        :return: the uptime (ms) or None on platforms without procfs
+        """
+        try:
+            with open("/proc/self/stat") as f:
+                start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+            with open("/proc/uptime") as f:
+                uptime = float(f.read().split()[0])
+        except (OSError, ValueError, IndexError):
+            return None
+
+        return round((uptime - start_ticks / os.sysconf("SC_CLK_TCK")) * 1000, 5)
+
+    @staticmethod
+    @contextmanager
+    def measure(
+        phase: str,
+        timings: Dict[str, Timed],
+        profiler: Optional[PhaseProfiler] = None,
+        memory_tracker: Optional[MemoryTracker] = None,
+    ) -> Generator[Timed, None, None]:
+        """Times a phase and applies the optional instrumentation to it.
+
+        :param phase: the name of the phase
+        :param timings: the mapping of phase to timing that the timing of the phase is added to
+        :param profiler: the optional profiler
+        :param memory_tracker: the optional memory tracker
+        """
+        with (
+            Timed().start() as timed,
+            memory_tracker.track(phase) if memory_tracker is not None else nullcontext(),
+            profiler.profile(phase) if profiler is not None else nullcontext(),
+        ):
+            timings[phase] = timed
+            yield timed
+
+    def run_once(
+        self, profiler: Optional[PhaseProfiler] = None, memory_tracker: Optional[MemoryTracker] = None
+    ) -> Tuple[Tuple[int | str, int | str], Dict[str, Timed]]:
+        """Runs the setup and both parts of the problem once.
+
+        :param profiler: the optional profiler of every phase
+        :param memory_tracker: the optional memory tracker of every phase
+        :return: a tuple of the answers to both parts and the timing of every phase
+        """
+        timings = {}
+        with self.measure("setup", timings, profiler, memory_tracker):
+            problem = self.problem_type() if self.cache is None else self.cache.construct(self.problem_type)
+
+        with self.measure("part_one", timings, profiler, memory_tracker):
             p1 = problem.part_one()
 
-        with Timed().start() as part2_time:
+        with self.measure("part_two", timings, profiler, memory_tracker):
             p2 = problem.part_two()
 
+        return (p1, p2), timings
+
+    def run_parallel_parts(self) -> Tuple[Tuple[int | str, int | str], Dict[str, Timed], Timed]:
+        """Runs the setup once and then forks a child process per part, so both parts run concurrently on the parsed
+        problem that the children share with the parent through copy-on-write. Every child sends its answer and timing
+        back over a pipe.
+
+        :return: a tuple of the answers to both parts, the timing of every phase and the wall time of both parts
+        """
+        timings = {}
+        with self.measure("setup", timings):
+            problem = self.problem_type() if self.cache is None else self.cache.construct(self.problem_type)
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        results = {}
+        with Timed().start() as parts_wall:
+            children = []
+            for phase in self.PHASES[1:]:
+                read_fd, write_fd = os.pipe()
+                pid = os.fork()
+                if pid == 0:
+                    os.close(read_fd)
+                    self.run_part_in_child(problem, phase, write_fd)
+
+                os.close(write_fd)
+                children.append((phase, pid, read_fd))
+
+            for phase, pid, read_fd in children:
+                with os.fdopen(read_fd, "rb") as f:
+                    payload = f.read()
+
+                os.waitpid(pid, 0)
+                results[phase] = pickle.loads(payload) if payload else (None, None, "the child process exited early")
+
+        answers = []
+        for phase in self.PHASES[1:]:
+            answer, execution_time_ns, error = results[phase]
+            if error is not None:
+                raise RuntimeError(f"{self.problem_type.__name__}.{phase} failed in its child process:\n{error}")
+
+            answers.append(answer)
+            timings[phase] = Timed.from_ns(execution_time_ns)
+
+        return (answers[0], answers[1]), timings, parts_wall
+
+    @staticmethod
+    def run_part_in_child(problem: Problem, phase: str, write_fd: int):
+        """Runs a part in a forked child process, writes its answer, timing or error to the pipe and exits the child.
+
+        :param problem: the parsed problem
+        :param phase: the name of the part
+        :param write_fd: the write end of the pipe to the parent
+        """
+        status = 0
+        try:
+            try:
+                with Timed().start() as timed:
+                    answer = getattr(problem, phase)()
+                payload = (answer, timed.execution_time_ns, None)
+            except BaseException:
+                payload = (None, None, traceback.format_exc())
+                status = 1
+
+            with os.fdopen(write_fd, "wb") as f:
+                pickle.dump(payload, f)
+        finally:
+            sys.stdout.flush()
+            os._exit(status)
+
+    def benchmark(self, repeats: int, warmup: int = 0) -> Tuple[Tuple[int | str, int | str], Dict[str, TimingStats]]:
+        """Runs the setup and both parts of the problem repeatedly. Every run constructs a new problem so that no
+        state leaks between runs and the warmup runs are discarded.
+
+        :param repeats: the number of timed runs
+        :param warmup: the number of untimed runs executed before the timed runs
+        :return: a tuple of the answers to both parts and the timing statistics of every phase
+        """
+        if repeats < 1:
+            raise ValueError(f"Invalid number of repeats: {repeats}")
+
+        samples = {phase: [] for phase in self.PHASES}
+        for i in range(warmup + repeats):
+            gc.collect()
+            answers, timings = self.run_once()
+            if i >= warmup:
+                for phase, timed in timings.items():
+                    samples[phase].append(timed.execution_time_ns)
+
+        return answers, {phase: TimingStats.from_ns(samples[phase]) for phase in self.PHASES}
+
+    def scaling(
+        self, sizes: List[int], repeats: int, warmup: int = 0, seed: int = 0
+    ) -> Dict[int, Dict[str, TimingStats]]:
+        """Benchmarks the problem over synthetic inputs of increasing sizes.
+
+        :param sizes: the sizes of the synthetic inputs
+        :param repeats: the number of timed runs per size
+        :param warmup: the number of untimed runs per size
+        :param seed: the seed of the synthetic input generator
+        :return: a mapping of size to the timing statistics of every phase
+        """
+        if not sizes:
+            raise ValueError(f"No scaling sizes for: {self.problem_type.__name__}")
+
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for size in sorted(sizes):
+                path = os.path.join(tmp_dir, f"{size}.txt")
+                with open(path, "w") as f:
+                    for line in self.problem_type.generate_input(size, random.Random(seed)):
+                        f.write(line + "\n")
+
+                with self.problem_type.use_input_file(path):
+                    _, results[size] = self.benchmark(repeats, warmup)
+
+                os.remove(path)
+
+        return results
+
+    @staticmethod
+    def growth_exponent(sizes: List[int], timings: List[float]) -> Optional[float]:
+        """Estimates the exponent k of `timing ~ size^k` with a least squares fit in log-log space.
+
+        :param sizes: the sizes of the inputs
+        :param timings: the timings of the inputs
+        :return: the estimated exponent or None if there are not enough positive measurements
+        """
+        points = [(math.log(size), math.log(timing)) for size, timing in zip(sizes, timings) if size > 0 and timing > 0]
+        if len(points) < 2:
+            return None
+
+        mean_x = statistics.fmean(x for x, _ in points)
+        mean_y = statistics.fmean(y for _, y in points)
+        variance = sum((x - mean_x) ** 2 for x, _ in points)
+        if variance == 0:
+            return None
+
+        return round(sum((x - mean_x) * (y - mean_y) for x, y in points) / variance, 2)
+
+    def print_scaling(self, results: Dict[int, Dict[str, TimingStats]]):
+        """Prints the median timings of every size, the growth exponent between consecutive sizes and the fitted
+        growth exponent of every phase.
+
+        :param results: a mapping of size to the timing statistics of every phase
+        """
+        sizes = sorted(results)
+        print("".join(["-" for i in range(30)]))
+        print(f"{self.problem_type.__name__} scaling (median ms)")
+        print(f"{'size':>12}" + "".join(f"{phase:>22}" for phase in self.PHASES))
+        for i, size in enumerate(sizes):
+            row = f"{size:>12}"
+            for phase in self.PHASES:
+                timing = results[size][phase].median
+                step = self.growth_exponent(
+                    sizes[i - 1 : i + 1], [results[s][phase].median for s in sizes[i - 1 : i + 1]]
+                )
+                row += f"{timing:>14}" + (f" (^{step})" if i > 0 and step is not None else "").rjust(8)
+            print(row)
+
+        print(
+            f"{'exponent':>12}"
+            + "".join(
+                f"{str(self.growth_exponent(sizes, [results[s][phase].median for s in sizes])):>22}"
+                for phase in self.PHASES
+            )
+        )
+        print("".join(["-" for i in range(30)]))
+
+    def print_answers(self, answers: Tuple[int | str, int | str]):
+        """Prints the header and the answers to both parts.
+
+        :param answers: the answers to both parts
+        """
         print("".join(["-" for i in range(30)]))
         print(self.problem_type.__name__)
 
         print("\n-------\nAnswers\n-------")
-        print(f"Part 1: {p1}")
-        print(f"Part 2: {p2}")
+        print(f"Part 1: {answers[0]}")
+        print(f"Part 2: {answers[1]}")
+
+    def print_run(
+        self,
+        answers: Tuple[int | str, int | str],
+        timings: Dict[str, Timed],
+        parts_wall: Optional[Timed] = None,
+        startup_time: Optional[float] = None,
+    ):
+        """Prints the answers and timings of a single run.
+
+        :param answers: the answers to both parts
+        :param timings: the timing of every phase
+        :param parts_wall: the wall time of both parts if they ran concurrently
+        :param startup_time: the time (ms) spent starting up and importing before the run
+        """
+        setup_time, part1_time, part2_time = (timings[phase] for phase in self.PHASES)
+        self.print_answers(answers)
 
         print("\n-----------\nTiming (ms)\n-----------")
+        if startup_time is not None:
+            print(f"Startup: {startup_time}")
         print(f"Setup: {setup_time.execution_time}")
         print(
             f"Part 1: algorithmic: {part1_time.execution_time} | "
@@ -85,4 +1561,359 @@ class ProblemRunner:
             f"Combined: algorithmic: {Timed.sum(part1_time, part2_time)} | "
             f"algorithmic + setup: {Timed.sum(setup_time, part1_time, part2_time)}"
         )
+        if parts_wall is not None:
+            print(
+                f"Parallel parts: wall: {parts_wall.execution_time} | sum of parts: {Timed.sum(part1_time, part2_time)}"
+                f" | wall + setup: {Timed.sum(setup_time, parts_wall)}"
+            )
+        print("".join(["-" for i in range(30)]))
+
+    def print_benchmark(
+        self,
+        answers: Tuple[int | str, int | str],
+        stats: Dict[str, TimingStats],
+        warmup: int,
+        startup_time: Optional[float] = None,
+    ):
+        """Prints the answers and the timing statistics of a benchmark.
+
+        :param answers: the answers to both parts
+        :param stats: the timing statistics of every phase
+        :param warmup: the number of untimed runs
+        :param startup_time: the time (ms) spent starting up and importing before the benchmark
+        """
+        self.print_answers(answers)
+
+        runs = len(stats["setup"].samples)
+        print(f"\n-----------\nTiming (ms)\n-----------\n{runs} runs after {warmup} warmup runs")
+        if startup_time is not None:
+            print(f"Startup: {startup_time}")
+        print(f"{'':<8}{'min':>12}{'median':>12}{'mean':>12}{'p95':>12}{'stddev':>12}")
+        for label, phase in zip(("Setup", "Part 1", "Part 2"), self.PHASES):
+            s = stats[phase]
+            print(f"{label:<8}{s.min:>12}{s.median:>12}{s.mean:>12}{s.p95:>12}{s.stddev:>12}")
         print("".join(["-" for i in range(30)]))
+
+
+def load_problem_types(module_path: str) -> List[Type[Problem]]:
+    """Imports a problem module and finds all the problems that it defines. The module is registered under a unique
+    name so that its classes can be pickled.
+
+    :param module_path: the path of the problem module
+    :return: the problems defined in the module
+    """
+    module_path = os.path.abspath(module_path)
+    year = os.path.basename(os.path.dirname(module_path))
+    module_name = f"aoc_{year}_{os.path.splitext(os.path.basename(module_path))[0]}"
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+
+    return [
+        obj
+        for _, obj in inspect.getmembers(module, inspect.isclass)
+        if issubclass(obj, Problem) and obj is not Problem and obj.__module__ == module_name
+    ]
+
+
+class SuiteRunner:
+    """Runner class that runs every problem of a year in parallel and reports a combined table of answers and
+    timings.
+    """
+
+    def __init__(self, year_dir: str, processes: Optional[int] = None, use_cache: bool = False):
+        self.year_dir = year_dir
+        self.processes = processes
+        self.use_cache = use_cache
+
+    @staticmethod
+    def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+        """Parses the suite options from the command line.
+
+        :param argv: the arguments to parse, defaults to the arguments of the current process
+        :return: the parsed options
+        """
+        parser = argparse.ArgumentParser(description="Runs every advent of code problem of a year in parallel.")
+        parser.add_argument("year_dir", help="the directory containing the problem modules, e.g. 2024")
+        parser.add_argument(
+            "-j", "--processes", type=int, default=None, help="number of worker processes, defaults to the cpu count"
+        )
+        parser.add_argument(
+            "--cache", action="store_true", help="restore the parsed inputs from the cache instead of parsing them"
+        )
+        parser.add_argument(
+            "--scaling",
+            action="store_true",
+            help="benchmark every problem over synthetic inputs of its scaling sizes and report the growth exponents",
+        )
+        parser.add_argument("--repeats", type=int, default=3, help="number of timed runs per size in scaling mode")
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="keep running and re-run every problem module as soon as it changes, see WatchRunner",
+        )
+        parser.add_argument("--interval", type=float, default=0.5, help="seconds between two checks in watch mode")
+        parser.add_argument(
+            "--runner-args",
+            default="",
+            help='options of the problem runner in watch mode, e.g. --runner-args="--benchmark --repeats 5"',
+        )
+        BenchmarkHistory.add_arguments(parser)
+        return parser.parse_args(argv)
+
+    @staticmethod
+    def main(argv: Optional[List[str]] = None):
+        """Runs the suite with the options found on the command line and prints the report.
+
+        :param argv: the arguments to parse, defaults to the arguments of the current process
+        """
+        args = SuiteRunner.parse_args(argv)
+        if args.watch:
+            WatchRunner(args.year_dir, args.interval, shlex.split(args.runner_args)).watch()
+            return
+
+        if args.scaling:
+            SuiteRunner(args.year_dir, args.processes).run_scaling(args.repeats)
+            return
+
+        results = SuiteRunner(args.year_dir, args.processes, args.cache).run()
+        if (args.record or args.compare) and BenchmarkHistory(args.history).check(
+            args,
+            [(r["name"], r["input_hash"], r["timings"]) for r in results if "error" not in r],
+            BenchmarkHistory.mode(args, suite=True),
+        ):
+            sys.exit(1)
+
+    def module_paths(self) -> List[str]:
+        """Finds all the problem modules of the year, e.g. 2024/01.py.
+
+        :return: the sorted paths of the problem modules
+        """
+        return sorted(glob.glob(os.path.join(self.year_dir, "[0-9][0-9].py")))
+
+    @staticmethod
+    def run_module(module_path: str, use_cache: bool = False) -> List[Dict]:
+        """Runs every problem defined in a problem module once. Failures are reported instead of raised so that a
+        single broken day does not abort the whole suite.
+
+        :param module_path: the path of the problem module
+        :param use_cache: whether to restore the parsed inputs from the cache
+        :return: the answers and timings (ms) of every problem in the module
+        """
+        results = []
+        with Timed().start() as wall_time:
+            try:
+                problem_types = load_problem_types(module_path)
+            except Exception as e:
+                problem_types = []
+                results.append({"name": os.path.basename(module_path), "error": repr(e)})
+
+            for problem_type in problem_types:
+                try:
+                    answers, timings = ProblemRunner(problem_type, ParsedInputCache() if use_cache else None).run_once()
+                    results.append(
+                        {
+                            "name": problem_type.__name__,
+                            "answers": answers,
+                            "input_hash": problem_type.input_hash(),
+                            "timings": {phase: timed.execution_time for phase, timed in timings.items()},
+                        }
+                    )
+                except Exception as e:
+                    results.append({"name": problem_type.__name__, "error": repr(e)})
+
+        for result in results:
+            result["wall_time"] = wall_time.execution_time
+
+        return results
+
+    def run(self) -> List[Dict]:
+        """Runs all the problem modules across a process pool and prints the combined report.
+
+        :return: the results of every problem
+        """
+        module_paths = self.module_paths()
+        if not module_paths:
+            raise ValueError(f"No problem modules found in: {self.year_dir}")
+
+        with Timed().start() as suite_time:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.processes) as executor:
+                results = [
+                    result
+                    for results in executor.map(self.run_module, module_paths, [self.use_cache] * len(module_paths))
+                    for result in results
+                ]
+
+        self.print_report(results, suite_time)
+        return results
+
+    @staticmethod
+    def scale_module(module_path: str, repeats: int) -> List[Dict]:
+        """Benchmarks every problem defined in a problem module over synthetic inputs of its scaling sizes. Failures
+        are reported instead of raised so that a single broken day does not abort the whole suite.
+
+        :param module_path: the path of the problem module
+        :param repeats: the number of timed runs per size
+        :return: the median timings (ms) of the largest size and the growth exponents of every problem in the module
+        """
+        results = []
+        try:
+            problem_types = load_problem_types(module_path)
+        except Exception as e:
+            return [{"name": os.path.basename(module_path), "error": repr(e)}]
+
+        for problem_type in problem_types:
+            try:
+                runner = ProblemRunner(problem_type)
+                scaling = runner.scaling(problem_type.scaling_sizes, repeats)
+                sizes = sorted(scaling)
+                results.append(
+                    {
+                        "name": problem_type.__name__,
+                        "size": sizes[-1],
+                        "timings": {phase: scaling[sizes[-1]][phase].median for phase in runner.PHASES},
+                        "exponents": {
+                            phase: runner.growth_exponent(sizes, [scaling[size][phase].median for size in sizes])
+                            for phase in runner.PHASES
+                        },
+                    }
+                )
+            except Exception as e:
+                results.append({"name": problem_type.__name__, "error": repr(e)})
+
+        return results
+
+    def run_scaling(self, repeats: int) -> List[Dict]:
+        """Benchmarks all the problem modules over synthetic inputs across a process pool and prints the growth
+        exponents of every problem.
+
+        :param repeats: the number of timed runs per size
+        :return: the scaling results of every problem
+        """
+        module_paths = self.module_paths()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.processes) as executor:
+            results = [
+                result
+                for results in executor.map(self.scale_module, module_paths, [repeats] * len(module_paths))
+                for result in results
+            ]
+
+        header = f"{'Problem':<20}{'Max size':>12}" + "".join(
+            f"{label + ' ms':>14}{label + ' ^k':>10}" for label in ("Setup", "Part 1", "Part 2")
+        )
+        print("".join(["-" for i in range(len(header))]))
+        print(header)
+        print("".join(["-" for i in range(len(header))]))
+        for result in results:
+            if "error" in result:
+                print(f"{result['name']:<20}ERROR: {result['error']}")
+                continue
+
+            print(
+                f"{result['name']:<20}{result['size']:>12}"
+                + "".join(
+                    f"{result['timings'][phase]:>14}{str(result['exponents'][phase]):>10}"
+                    for phase in ProblemRunner.PHASES
+                )
+            )
+        print("".join(["-" for i in range(len(header))]))
+        return results
+
+    @staticmethod
+    def print_report(results: List[Dict], suite_time: Timed):
+        """Prints the combined table of answers and timings.
+
+        :param results: the results of every problem
+        :param suite_time: the wall-clock time of the whole suite
+        """
+        header = f"{'Problem':<20}{'Part 1':>18}{'Part 2':>18}{'Setup':>12}{'Part 1':>12}{'Part 2':>12}{'Wall':>12}"
+        print("".join(["-" for i in range(len(header))]))
+        print(header)
+        print("".join(["-" for i in range(len(header))]))
+        for result in results:
+            if "error" in result:
+                print(f"{result['name']:<20}ERROR: {result['error']}")
+                continue
+
+            timings = result["timings"]
+            print(
+                f"{result['name']:<20}{result['answers'][0]:>18}{result['answers'][1]:>18}"
+                f"{timings['setup']:>12}{timings['part_one']:>12}{timings['part_two']:>12}{result['wall_time']:>12}"
+            )
+
+        print("".join(["-" for i in range(len(header))]))
+        wall_times = {result["name"]: result["wall_time"] for result in results}
+        print(f"Sum of per-day wall-clock (ms): {round(sum(wall_times.values()), 5)}")
+        print(f"Suite wall-clock (ms): {suite_time.execution_time}")
+        print("".join(["-" for i in range(len(header))]))
+
+
+class WatchRunner:
+    """Long-lived runner that watches the problem modules of a year and re-runs a module through `ProblemRunner` as
+    soon as it changes. The interpreter and utils stay warm between runs, so a run only pays for re-importing the
+    changed module, which is reported as its startup time. Single runs also restore the parsed inputs from memory while
+    the parser of the problem is unchanged, benchmark and history runs always parse.
+    """
+
+    def __init__(self, year_dir: str, interval: float = 0.5, runner_args: Optional[List[str]] = None):
+        self.year_dir = year_dir
+        self.interval = interval
+        self.runner_args = runner_args or []
+        self.cache = MemoryParsedInputCache()
+        self.mtimes = {}
+
+    def changed_modules(self) -> List[str]:
+        """Finds the problem modules that were added or modified since the last check.
+
+        :return: the sorted paths of the changed modules
+        """
+        mtimes = {}
+        for path in SuiteRunner(self.year_dir).module_paths():
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+        changed = [path for path, mtime in mtimes.items() if self.mtimes.get(path) != mtime]
+        self.mtimes = mtimes
+        return changed
+
+    def run_module(self, module_path: str):
+        """Reloads a problem module and runs all of its problems. Failures are reported instead of raised so that the
+        runner keeps watching.
+
+        :param module_path: the path of the problem module
+        """
+        print(f"\n{time.strftime('%H:%M:%S')} running {module_path}")
+        try:
+            with Timed().start() as import_time:
+                problem_types = load_problem_types(module_path)
+
+            for problem_type in problem_types:
+                self.cache.prepare(problem_type)
+
+            for problem_type in problem_types:
+                ProblemRunner(problem_type, self.cache, import_time.execution_time).run(self.runner_args)
+        except SystemExit:
+            pass
+        except Exception:
+            traceback.print_exc()
+
+    def watch(self, max_checks: Optional[int] = None):
+        """Watches the problem modules until interrupted. The modules that exist at startup are not run until they
+        change.
+
+        :param max_checks: the number of checks after which to stop, defaults to watching forever
+        """
+        self.changed_modules()
+        print(f"Startup: {ProblemRunner.process_uptime()} ms, watching {len(self.mtimes)} modules in {self.year_dir}")
+        checks = 0
+        try:
+            while max_checks is None or checks < max_checks:
+                time.sleep(self.interval)
+                for module_path in self.changed_modules():
+                    self.run_module(module_path)
+                checks += 1
+        except KeyboardInterrupt:
+            pass